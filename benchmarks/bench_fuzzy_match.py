@@ -0,0 +1,109 @@
+"""
+Micro-benchmark for POG name verification scoring.
+Compares the nested fuzz.partial_ratio loop previously in verify_cards
+(lowercasing inside the loop) with utils.fuzzy_match.best_match over
+card names from the OCR corpus labels against OCR-like noisy reads, and
+checks that both score every pair the same, so the > 70 threshold keeps
+its meaning.
+
+    python benchmarks/bench_fuzzy_match.py [--rounds N] [--seed S]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fuzzywuzzy import fuzz as legacy_fuzz
+from utils.fuzzy_match import best_match, score_matrix
+
+LABELS = [os.path.join(ROOT, 'benchmarks', 'corpus', 'drops', name, 'labels.json') for name in ('synthetic', 'real')]
+CONFUSIONS = {'l': 'I', 'i': 'l', 'o': '0', 'e': 'c', 'a': 'o', 'n': 'm', 'rn': 'm'}
+
+def noisy(rng, text):
+    """Simulate OCR errors: character confusions, drops and stray characters"""
+    out = []
+    for char in text:
+        roll = rng.random()
+        if roll < 0.08:
+            out.append(CONFUSIONS.get(char.lower(), char))
+        elif roll < 0.11:
+            continue
+        elif roll < 0.13:
+            out.append(char + rng.choice('.,\'|'))
+        else:
+            out.append(char)
+    return ''.join(out)
+
+def legacy_verify(names, texts):
+    """The original loop: first card with any name box scoring > 70"""
+    for i, name in enumerate(names):
+        for text in texts:
+            if legacy_fuzz.partial_ratio(name.lower(), text.lower()) > 70:
+                return i
+    return None
+
+def matrix_verify(names, texts):
+    match = best_match(names, texts, threshold=70)
+    return match[0] if match else None
+
+def make_cases(rng):
+    labels = []
+    for path in LABELS:
+        with open(path, 'r') as f:
+            labels.extend(json.load(f).values())
+    cases = []
+    for label in labels:
+        names = [card['name'] for card in label['cards']]
+        texts = [noisy(rng, name) for name in names]
+        cases.append((names, texts))
+        # Pog cards that are not in the OCR'd boxes (no match expected)
+        cases.append((names[:1], [noisy(rng, card['series']) for card in label['cards']]))
+    return cases
+
+def score_mismatches(cases):
+    """Pairs where the matrix score differs from the original per-pair score"""
+    mismatches = 0
+    for names, texts in cases:
+        for name, row in zip(names, score_matrix(names, texts)):
+            mismatches += sum(score != legacy_fuzz.partial_ratio(name.lower(), text.lower()) for text, score in zip(texts, row))
+    return mismatches
+
+def bench(func, cases, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for names, texts in cases:
+            func(names, texts)
+    elapsed = time.perf_counter() - start
+    return len(cases) * rounds / elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rounds', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    cases = make_cases(random.Random(args.seed))
+    legacy_found = sum(legacy_verify(*case) is not None for case in cases)
+    matrix_found = sum(matrix_verify(*case) is not None for case in cases)
+
+    legacy = bench(legacy_verify, cases, args.rounds)
+    matrix = bench(matrix_verify, cases, args.rounds)
+    print(json.dumps({
+        'drops': len(cases),
+        'pairs_per_drop': round(sum(len(n) * len(t) for n, t in cases) / len(cases), 2),
+        'rounds': args.rounds,
+        'legacy_verified': legacy_found,
+        'matrix_verified': matrix_found,
+        'score_mismatches': score_mismatches(cases),
+        'legacy_drops_per_sec': round(legacy),
+        'matrix_drops_per_sec': round(matrix),
+        'speedup': round(matrix / legacy, 2)
+    }, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+"""
+Offline OCR benchmark for POG verification.
+Runs the drop pipeline (text band decode, easyocr ROI reads) over the
+corpora in benchmarks/corpus/drops without Discord or network and prints
+JSON with one section per corpus: per-image and per-ROI latency
+percentiles, throughput of the OCR pool at several worker counts and field
+scores, including the name/series partial_ratio > 70 rate used by
+verification.
+
+synthetic/ is generated by make_ocr_corpus.py (Hershey text on a flat
+background). Its field scores are reported as 'pipeline_smoke' and only
+show that the pipeline reads the right boxes; they say nothing about
+accuracy on Sofi drops. Only real/, drop images saved from Sofi with
+hand-checked labels, is reported as 'accuracy'. real/ ships empty, so
+there are no accuracy numbers until drops are added: copy the image into
+real/ and its cards to real/labels.json:
+    "drop_123.png": {"cards": [{"name": ..., "series": ..., "gen": "1234"}, ...]}
+
+    python benchmarks/bench_ocr.py [--corpus real] [--workers 1,2,4] [--rounds N] [--out results.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from utils.ocr import FIELDS, decode_text_band, extract_card_fields
+from utils.ocr_pool import OCRPool, _init_worker
+from utils.fuzzy_match import score_matrix
+
+CORPORA = os.path.join(ROOT, 'benchmarks', 'corpus', 'drops')
+CORPUS_SETS = ['synthetic', 'real']
+FUZZY_THRESHOLD = 70
+
+def percentiles(samples):
+    """p50/p90/p99/max in milliseconds"""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+
+    def pick(q):
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 3)
+    return {'p50': pick(0.5), 'p90': pick(0.9), 'p99': pick(0.99), 'max': round(ordered[-1] * 1000, 3), 'n': len(ordered)}
+
+def peak_rss_mb(who=resource.RUSAGE_SELF):
+    # ru_maxrss is in KiB on Linux, bytes on macOS
+    rss = resource.getrusage(who).ru_maxrss
+    return round(rss / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+def load_corpus(path):
+    try:
+        with open(os.path.join(path, 'labels.json'), 'r') as f:
+            labels = json.load(f)
+    except FileNotFoundError:
+        return []
+    drops = []
+    for filename, label in sorted(labels.items()):
+        with open(os.path.join(path, filename), 'rb') as f:
+            drops.append((filename, f.read(), label['cards']))
+    return drops
+
+def score_fields(results, drops):
+    """Exact-match and fuzzy (> FUZZY_THRESHOLD) rates per field"""
+    totals = {field: {'exact': 0, 'fuzzy': 0, 'n': 0} for field in FIELDS}
+    misses = []
+    for cards, (filename, _, expected) in zip(results, drops):
+        for read, label in zip(cards, expected):
+            for field in FIELDS:
+                want = str(label.get(field) or '').strip()
+                got = str(read.get(field) or '').strip()
+                total = totals[field]
+                total['n'] += 1
+                if got.lower() == want.lower():
+                    total['exact'] += 1
+                if score_matrix([want], [got])[0][0] > FUZZY_THRESHOLD:
+                    total['fuzzy'] += 1
+                elif len(misses) < 20:
+                    misses.append({'image': filename, 'card': read['card'], 'field': field, 'expected': want, 'read': got})
+    accuracy = {
+        field: {
+            'exact': round(t['exact'] / t['n'], 4) if t['n'] else None,
+            f'partial_ratio_gt_{FUZZY_THRESHOLD}': round(t['fuzzy'] / t['n'], 4) if t['n'] else None,
+            'n': t['n'],
+        }
+        for field, t in totals.items()
+    }
+    return accuracy, misses
+
+def bench_inline(drops, rounds):
+    """Single-process pipeline timings and accuracy"""
+    decode_times, image_times, roi_times = [], [], []
+    results = []
+    for round_no in range(rounds):
+        for _, data, expected in drops:
+            start = time.perf_counter()
+            band = decode_text_band(data)
+            decoded = time.perf_counter()
+            cards = extract_card_fields([(band, len(expected))])[0]
+            done = time.perf_counter()
+            decode_times.append(decoded - start)
+            image_times.append(done - start)
+            roi_times.append((done - decoded) / (len(expected) * len(FIELDS)))
+            if round_no == 0:
+                results.append(cards)
+    return {
+        'decode_ms': percentiles(decode_times),
+        'image_ms': percentiles(image_times),
+        'roi_ms': percentiles(roi_times),
+    }, results
+
+async def bench_pool(drops, workers, rounds):
+    """Images per second through OCRPool with every drop queued at once"""
+    pool = OCRPool(workers=workers, max_queue=len(drops) * rounds + 1)
+    try:
+        await pool.warm_up()
+        bands = [(decode_text_band(data), len(expected)) for _, data, expected in drops]
+        await asyncio.gather(*[pool.run_batched(extract_card_fields, band) for band in bands])
+        start = time.perf_counter()
+        await asyncio.gather(*[pool.run_batched(extract_card_fields, band) for band in bands * rounds])
+        elapsed = time.perf_counter() - start
+    finally:
+        await pool.close()
+    return {'workers': workers, 'images': len(bands) * rounds, 'images_per_sec': round(len(bands) * rounds / elapsed, 2)}
+
+def bench_corpus(name, drops, rounds, workers):
+    latency, results = bench_inline(drops, rounds)
+    scores, misses = score_fields(results, drops)
+    return {
+        'corpus': name,
+        'images': len(drops),
+        'latency': latency,
+        'throughput': [asyncio.run(bench_pool(drops, count, rounds)) for count in workers],
+        # Generated images only prove the pipeline runs end to end, not how well it reads Sofi drops
+        'accuracy' if name == 'real' else 'pipeline_smoke': scores,
+        'misses': misses,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--corpus', action='append', choices=CORPUS_SETS,
+                        help='corpus to run, repeat for several (default: all)')
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--workers', default='1,2,4', help='comma separated OCR pool sizes, empty to skip')
+    parser.add_argument('--out', help='also write the JSON report to this file')
+    args = parser.parse_args()
+
+    corpora = {name: load_corpus(os.path.join(CORPORA, name)) for name in args.corpus or CORPUS_SETS}
+    if not any(corpora.values()):
+        raise SystemExit(f'❌ No drops in {CORPORA} (python benchmarks/make_ocr_corpus.py)')
+    workers = [int(count) for count in args.workers.split(',') if count.strip()]
+
+    _init_worker()
+    first = next(drops for drops in corpora.values() if drops)
+    extract_card_fields([(decode_text_band(first[0][1]), 3)])  # first call loads the models
+    # Synthetic and real drops are never pooled, their accuracy means different things
+    sets = {}
+    for name, drops in corpora.items():
+        if not drops:
+            sets[name] = {'skipped': f'no labelled drops in {os.path.relpath(os.path.join(CORPORA, name), ROOT)}'}
+            continue
+        sets[name] = bench_corpus(name, drops, args.rounds, workers)
+
+    report = {
+        'rounds': args.rounds,
+        'corpora': sets,
+        'peak_rss_mb': {'main': peak_rss_mb(), 'workers': peak_rss_mb(resource.RUSAGE_CHILDREN)},
+    }
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.out:
+        with open(args.out, 'w') as f:
+            f.write(output + '\n')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Micro-benchmark for Sofi drop parsing (POG.on_message hot path).
+Compares the compiled single-pass parser against the previous
+per-line re.match/re.search implementation over recorded drop messages.
+
+    python benchmarks/bench_sofi_parser.py [--rounds N]
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from utils.sofi_parser import find_pog_cards
+
+CORPUS = os.path.join(ROOT, 'benchmarks', 'corpus', 'sofi_drops.json')
+
+def legacy_find_pog_cards(content):
+    """The original parsing loop from POG.on_message"""
+    if ('0]' in content or
+        not any(x in content for x in ['1]', '2]', '3]'])):
+        return []
+    pog_cards = []
+    for line in content.split('\n'):
+        position_match = re.match(r'^`?([123])\]', line.strip())
+        if not position_match:
+            continue
+        heart_match = re.search(r':heart:\s+`(\d+)', line)
+        gid_match = re.search(r'`ɢ\s*(\d+)', line)
+        name_match = re.search(r'`[0-9]+\]\s+.+?•\s+\*\*(.+?)\*\*', line)
+        hearts = int(heart_match.group(1)) if heart_match else 0
+        gid = int(gid_match.group(1)) if gid_match else None
+        card_name = name_match.group(1).strip() if name_match else None
+        if hearts > 99 or (gid and gid < 100):
+            pog_cards.append({'card': int(position_match.group(1)), 'name': card_name, 'gid': gid, 'hearts': hearts})
+    return pog_cards
+
+def bench(func, messages, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for content in messages:
+            func(content)
+    elapsed = time.perf_counter() - start
+    return len(messages) * rounds / elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rounds', type=int, default=2000)
+    args = parser.parse_args()
+
+    with open(CORPUS, 'r') as f:
+        messages = json.load(f)
+
+    for content in messages:
+        expected = legacy_find_pog_cards(content)
+        actual = find_pog_cards(content)
+        if actual != expected:
+            raise SystemExit(f'❌ Parser mismatch for {content!r}:\n  legacy: {expected}\n  new:    {actual}')
+
+    legacy = bench(legacy_find_pog_cards, messages, args.rounds)
+    compiled = bench(find_pog_cards, messages, args.rounds)
+    print(json.dumps({
+        'messages': len(messages),
+        'rounds': args.rounds,
+        'legacy_msgs_per_sec': round(legacy),
+        'compiled_msgs_per_sec': round(compiled),
+        'speedup': round(compiled / legacy, 2)
+    }, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Generates the synthetic drop image corpus used by bench_ocr.py.
+Draws three cards with name/series/gen text at the CARD_COORDS boxes
+(some images rescaled to exercise scale normalization) and writes
+labels.json next to the images in corpus/drops/synthetic. Real drops go
+in corpus/drops/real instead (see bench_ocr.py), never in here: this
+folder is overwritten on every run.
+
+    python benchmarks/make_ocr_corpus.py [--count N] [--seed S]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import cv2
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from utils.ocr import REFERENCE_WIDTH, roi_box
+
+OUT_DIR = os.path.join(ROOT, 'benchmarks', 'corpus', 'drops', 'synthetic')
+SERIES = ['Genshin Impact', 'Honkai Star Rail', 'Zenless Zone Zero', 'Wuthering Waves']
+HEIGHT = 560
+
+def draw_text(img, text, box, scale):
+    x, y, w, h = box
+    cv2.putText(img, text, (x + 4, y + h - 7), cv2.FONT_HERSHEY_SIMPLEX, scale, (235, 235, 235), 1, cv2.LINE_AA)
+
+def make_drop(rng, names):
+    img = np.full((HEIGHT, REFERENCE_WIDTH, 3), 30, np.uint8)
+    cards = []
+    for card in range(1, 4):
+        name = rng.choice(names)
+        series = rng.choice(SERIES)
+        gen = str(rng.choice([rng.randint(1, 99), rng.randint(100, 9999)]))
+        x = roi_box(card, 'name')[0]
+        cv2.rectangle(img, (x - 6, 20), (x + 296, HEIGHT - 20), (60, 50, 70), -1)
+        draw_text(img, gen, roi_box(card, 'gen'), 0.6)
+        draw_text(img, name, roi_box(card, 'name'), 0.55)
+        draw_text(img, series, roi_box(card, 'series'), 0.5)
+        cards.append({'name': name, 'series': series, 'gen': gen})
+    return img, cards
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=12)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with open(os.path.join(ROOT, 'data', 'data.json'), 'r') as f:
+        names = sorted(json.load(f))
+    os.makedirs(OUT_DIR, exist_ok=True)
+    labels = {}
+    for i in range(args.count):
+        img, cards = make_drop(rng, names)
+        # Every fourth drop at another size, like re-encoded or resized uploads
+        if i % 4 == 3:
+            width = rng.choice([756, 1344])
+            img = cv2.resize(img, (width, HEIGHT * width // REFERENCE_WIDTH), interpolation=cv2.INTER_AREA)
+        filename = f'drop_{i:03d}.png'
+        cv2.imwrite(os.path.join(OUT_DIR, filename), img, [cv2.IMWRITE_PNG_COMPRESSION, 9])
+        labels[filename] = {'cards': cards}
+    with open(os.path.join(OUT_DIR, 'labels.json'), 'w') as f:
+        json.dump(labels, f, indent=2)
+    print(f'✅ Wrote {len(labels)} drops to {OUT_DIR}')
+
+if __name__ == '__main__':
+    main()
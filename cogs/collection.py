@@ -1,43 +1,33 @@
 import discord
 from discord.ext import commands
-import json
-import os
+from utils.inventory_store import create_inventory_store, SORTS
+from utils.metrics import metrics
+
+COMMAND_SECONDS = metrics.histogram('bot_collection_command_seconds', 'Collection command latency', labels=('command',))
 
 class Collection(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.inventory_dir = 'data/inventory'
-        os.makedirs(self.inventory_dir, exist_ok=True)
-    
-    def get_inventory_path(self, username):
-        return os.path.join(self.inventory_dir, f"{username}.json")
-    
-    def load_inventory(self, username):
-        path = self.get_inventory_path(username)
-        try:
-            with open(path, 'r') as f:
-                return json.load(f)
-        except:
-            return []
+        self.store = create_inventory_store()
     
     @commands.command(name='c')
-    async def view_collection(self, ctx):
-        """View all card codes in your collection"""
-        inventory = self.load_inventory(ctx.author.name)
+    async def view_collection(self, ctx, sort: str = None, prefix: str = None):
+        """View card codes in your collection, e.g. `mc`, `mc code`, `mc -code ab`, `mc ab`"""
+        if sort and sort not in SORTS:
+            sort, prefix = None, sort
         
-        if not inventory:
-            await ctx.reply('📭 You have no cards in your collection.')
-            return
+        view = CollectionPaginationView(self.store, ctx.author, sort, prefix)
+        with COMMAND_SECONDS.time('c'):
+            await view.load_page(0)
         
-        codes = '\n'.join([f'🔹 `{card["code"]}`' for card in inventory])
-        
-        embed = discord.Embed(
-            title=f"{ctx.author.name}'s Collection",
-            description=codes,
-            color=0x3498db
-        )
+        if not view.total:
+            if prefix:
+                await ctx.reply(f'📭 No cards in your collection have codes starting with `{prefix}`.')
+            else:
+                await ctx.reply('📭 You have no cards in your collection.')
+            return
         
-        await ctx.reply(embed=embed)
+        view.message = await ctx.reply(embed=view.generate_embed(), view=view)
     
     @commands.command(name='v')
     async def view_card(self, ctx, code: str = None):
@@ -46,8 +36,8 @@ class Collection(commands.Cog):
             await ctx.reply('❌ Please provide a card code. Example: `mv abcd1234`')
             return
         
-        inventory = self.load_inventory(ctx.author.name)
-        card = next((c for c in inventory if c['code'] == code), None)
+        with COMMAND_SECONDS.time('v'):
+            card = await self.store.get_card(ctx.author.name, code)
         
         if not card:
             await ctx.reply(f'❌ No card found with code `{code}`.')
@@ -62,5 +52,88 @@ class Collection(commands.Cog):
         
         await ctx.reply(embed=embed)
 
+class CollectionPaginationView(discord.ui.View):
+    def __init__(self, store, author, sort=None, prefix=None, per_page=15):
+        super().__init__(timeout=300)
+        self.store = store
+        self.author = author
+        self.sort = sort
+        self.prefix = prefix
+        self.per_page = per_page
+        self.page = 0
+        self.cards = []
+        self.total = 0
+        self.message = None
+        self.add_navigation_buttons()
+    
+    @property
+    def total_pages(self):
+        return max(1, (self.total + self.per_page - 1) // self.per_page)
+    
+    async def load_page(self, page):
+        """Fetch only the cards shown on this page"""
+        self.page = page
+        self.cards, self.total = await self.store.get_page(
+            self.author.name, page * self.per_page, self.per_page, self.sort, self.prefix
+        )
+        self.update_buttons()
+    
+    def generate_embed(self):
+        codes = '\n'.join([f'🔹 `{card["code"]}`' for card in self.cards])
+        
+        embed = discord.Embed(
+            title=f"{self.author.name}'s Collection",
+            description=codes or 'No cards on this page.',
+            color=0x3498db
+        )
+        details = [f'{self.total} cards']
+        if self.sort:
+            details.append(f'sorted by {self.sort}')
+        if self.prefix:
+            details.append(f'codes starting with {self.prefix}')
+        embed.set_footer(text=f'Page {self.page + 1} of {self.total_pages} | ' + ', '.join(details))
+        return embed
+    
+    def add_navigation_buttons(self):
+        self.first_btn = discord.ui.Button(label='⏮️', style=discord.ButtonStyle.secondary)
+        self.prev_btn = discord.ui.Button(label='⬅️', style=discord.ButtonStyle.secondary)
+        self.next_btn = discord.ui.Button(label='➡️', style=discord.ButtonStyle.secondary)
+        self.last_btn = discord.ui.Button(label='⏭️', style=discord.ButtonStyle.secondary)
+        
+        self.first_btn.callback = lambda i: self.navigate_callback(i, 0)
+        self.prev_btn.callback = lambda i: self.navigate_callback(i, max(0, self.page - 1))
+        self.next_btn.callback = lambda i: self.navigate_callback(i, min(self.total_pages - 1, self.page + 1))
+        self.last_btn.callback = lambda i: self.navigate_callback(i, self.total_pages - 1)
+        
+        self.add_item(self.first_btn)
+        self.add_item(self.prev_btn)
+        self.add_item(self.next_btn)
+        self.add_item(self.last_btn)
+        self.update_buttons()
+    
+    def update_buttons(self):
+        # Disabled at the ends so extra clicks don't reload (and re-stream) the same page
+        self.first_btn.disabled = self.prev_btn.disabled = self.page == 0
+        self.next_btn.disabled = self.last_btn.disabled = self.page >= self.total_pages - 1
+    
+    async def navigate_callback(self, interaction, new_page):
+        if interaction.user != self.author:
+            await interaction.response.send_message('Not for you.', ephemeral=True)
+            return
+        
+        # Large inventories are streamed from disk, which can outlast the 3s interaction deadline
+        await interaction.response.defer()
+        await self.load_page(new_page)
+        await interaction.edit_original_response(embed=self.generate_embed(), view=self)
+    
+    async def on_timeout(self):
+        for item in self.children:
+            item.disabled = True
+        if self.message:
+            try:
+                await self.message.edit(view=self)
+            except discord.HTTPException:
+                pass
+
 async def setup(bot):
-    await bot.add_cog(Collection(bot))
\ No newline at end of file
+    await bot.add_cog(Collection(bot))
@@ -0,0 +1,56 @@
+import discord
+from discord.ext import commands
+import io
+import time
+from utils.loop_watchdog import watchdog
+
+class Debug(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.owner_id = 587709425708695552
+    
+    @commands.command(name='lag')
+    async def loop_lag(self, ctx, mode: str = 'worst'):
+        """Dump the worst (or 'recent') event loop stalls, 'reset' clears them (owner only)"""
+        if ctx.author.id != self.owner_id:
+            return
+        
+        if mode == 'reset':
+            watchdog.reset()
+            await ctx.reply('🧹 Loop stall history cleared.')
+            return
+        
+        entries = watchdog.recent_stalls() if mode == 'recent' else watchdog.worst_offenders()
+        embed = discord.Embed(
+            title=f'🐶 Event loop stalls ({mode})',
+            description=(
+                f'Last lag: **{watchdog.last_lag * 1000:.1f}ms** | '
+                f'Max lag: **{watchdog.max_lag * 1000:.1f}ms** | '
+                f'Threshold: **{watchdog.threshold * 1000:.0f}ms**'
+            ),
+            color=discord.Color.orange()
+        )
+        
+        if not entries:
+            embed.add_field(name='Nothing recorded', value='The loop has not stalled past the threshold.', inline=False)
+            await ctx.reply(embed=embed)
+            return
+        
+        report = []
+        for i, entry in enumerate(entries, 1):
+            when = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(entry['at']))
+            header = f'#{i} {entry["kind"]} {entry["duration"] * 1000:.0f}ms at {when} in {entry["task"]}'
+            report.append(header + '\n' + entry['stack'])
+            if i <= 10:
+                embed.add_field(
+                    name=f'#{i} {entry["duration"] * 1000:.0f}ms {entry["kind"]}',
+                    value=f'`{entry["task"][:200]}` <t:{int(entry["at"])}:R>',
+                    inline=False
+                )
+        
+        # Full stacks go in an attachment, they do not fit an embed
+        file = discord.File(io.BytesIO('\n\n'.join(report).encode()), filename='loop_stalls.txt')
+        await ctx.reply(embed=embed, file=file)
+
+async def setup(bot):
+    await bot.add_cog(Debug(bot))
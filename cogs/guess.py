@@ -1,26 +1,33 @@
 import discord
 from discord.ext import commands
-import json
-import random
-import aiohttp
-from PIL import Image, ImageFilter
 from io import BytesIO
-import asyncio
 import time
+from utils.puzzle_cache import PuzzlePrefetcher
+from utils.guess_sessions import GuessSessionManager
+from utils.character_index import CharacterIndex
+from utils.metrics import metrics
+
+PUZZLE_SECONDS = metrics.histogram('bot_guess_puzzle_seconds', 'Time to get a puzzle when a game starts')
+GAMES = metrics.counter('bot_guess_games_total', 'Finished guess games', labels=('result',))
 
 class Guess(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.data = self.load_data()
+        self.index = CharacterIndex('data/data.json')
         self.cooldowns = {}
         self.COOLDOWN_TIME = 2
+        self.prefetcher = PuzzlePrefetcher(self.index)
+        self.sessions = GuessSessionManager()
+        metrics.gauge('bot_guess_active_games', 'Running guess games', func=lambda: len(self.sessions.sessions))
+        metrics.gauge('bot_guess_ready_puzzles', 'Pre-rendered puzzles waiting', func=lambda: len(self.prefetcher.ready))
+        self.GUESS_TIMEOUT = 20.0
     
-    def load_data(self):
-        try:
-            with open('data/data.json', 'r') as f:
-                return json.load(f)
-        except:
-            return {}
+    async def cog_load(self):
+        self.prefetcher.start()
+    
+    async def cog_unload(self):
+        self.sessions.close_all()
+        await self.prefetcher.close()
     
     def check_cooldown(self, user_id):
         now = time.time()
@@ -32,6 +39,21 @@ class Guess(commands.Cog):
         self.cooldowns[user_id] = now + self.COOLDOWN_TIME
         return 0
     
+    @commands.Cog.listener()
+    async def on_message(self, message):
+        self.sessions.handle_message(message)
+    
+    def reveal(self, correct_name, img_data):
+        """Full character embed shown when a game ends"""
+        full_file = discord.File(BytesIO(img_data), filename='full.png')
+        full_embed = discord.Embed(
+            title=f'🎯 It was: {correct_name}',
+            color=0x1ABC9C
+        )
+        full_embed.set_image(url='attachment://full.png')
+        full_embed.set_footer(text='Thanks for playing! 🔍')
+        return full_embed, full_file
+    
     @commands.command(name='guess', aliases=['mguess'])
     async def guess_game(self, ctx):
         """Start a character guessing game"""
@@ -41,49 +63,22 @@ class Guess(commands.Cog):
             await ctx.reply(f'⏳ Please wait **{remaining} second(s)** before guessing again.')
             return
         
-        if not self.data:
+        if not len(self.index):
             await ctx.reply('❌ No character data available.')
             return
         
-        # Select random character
-        names = list(self.data.keys())
-        correct_name = random.choice(names)
-        image_url = self.data[correct_name]
+        # Reserve the channel so overlapping games can't race
+        session = self.sessions.open(ctx.channel.id)
+        if session is None:
+            await ctx.reply('🧠 A game is already running in this channel!')
+            return
         
         try:
-            # Download and process image
-            async with aiohttp.ClientSession() as session:
-                async with session.get(image_url, headers={'User-Agent': 'Mozilla/5.0'}) as response:
-                    img_data = await response.read()
-            
-            image = Image.open(BytesIO(img_data))
-            width, height = image.size
+            # Take a pre-rendered puzzle (renders one on demand if the pool is empty)
+            with PUZZLE_SECONDS.time():
+                correct_name, img_data, puzzle_png, should_blur = await self.prefetcher.take()
             
-            # Create crop dimensions
-            crop_width = min(200, int(width * 0.3))
-            crop_height = min(200, int(height * 0.3))
-            
-            if crop_width <= 0 or crop_height <= 0:
-                raise Exception('Image too small to crop')
-            
-            # Random crop position
-            left = random.randint(0, width - crop_width)
-            top = random.randint(0, height - crop_height)
-            
-            # Crop image
-            cropped = image.crop((left, top, left + crop_width, top + crop_height))
-            
-            # Maybe blur
-            should_blur = random.choice([True, False])
-            if should_blur:
-                cropped = cropped.filter(ImageFilter.GaussianBlur(radius=8))
-            
-            # Convert to bytes
-            buffer = BytesIO()
-            cropped.save(buffer, format='PNG')
-            buffer.seek(0)
-            
-            puzzle_file = discord.File(buffer, filename='puzzle.png')
+            puzzle_file = discord.File(BytesIO(puzzle_png), filename='puzzle.png')
             
             # Create puzzle embed
             embed = discord.Embed(
@@ -98,51 +93,22 @@ class Guess(commands.Cog):
             
             print(f'✅ Sent {"blurred" if should_blur else "cropped"} puzzle for {correct_name}')
             
-            # Wait for answers
-            answered_correctly = False
+            # Wait for the first correct answer (routed by on_message)
+            self.sessions.arm(
+                session, correct_name, self.GUESS_TIMEOUT,
+                check=lambda content: self.index.matches(correct_name, content)
+            )
+            winner = await session.wait()
+            GAMES.inc(1, 'won' if winner else 'timeout')
             
-            def check(m):
-                return not m.author.bot and m.channel == ctx.channel
+            if winner:
+                await puzzle_message.reply(f'🎉 {winner.author.mention} guessed it right! It was **{correct_name}**!')
+            else:
+                await puzzle_message.reply(f'⏰ Time\'s up! The correct answer was **{correct_name}**.')
             
-            try:
-                while True:
-                    message = await self.bot.wait_for('message', check=check, timeout=20.0)
-                    
-                    if correct_name.lower() in message.content.lower():
-                        answered_correctly = True
-                        
-                        await puzzle_message.reply(f'🎉 {message.author.mention} guessed it right! It was **{correct_name}**!')
-                        
-                        # Show full image
-                        full_buffer = BytesIO(img_data)
-                        full_file = discord.File(full_buffer, filename='full.png')
-                        
-                        full_embed = discord.Embed(
-                            title=f'🎯 It was: {correct_name}',
-                            color=0x1ABC9C
-                        )
-                        full_embed.set_image(url='attachment://full.png')
-                        full_embed.set_footer(text='Thanks for playing! 🔍')
-                        
-                        await puzzle_message.edit(embed=full_embed, attachments=[full_file])
-                        break
-                        
-            except asyncio.TimeoutError:
-                if not answered_correctly:
-                    await puzzle_message.reply(f'⏰ Time\'s up! The correct answer was **{correct_name}**.')
-                    
-                    # Show full image
-                    full_buffer = BytesIO(img_data)
-                    full_file = discord.File(full_buffer, filename='full.png')
-                    
-                    full_embed = discord.Embed(
-                        title=f'🎯 It was: {correct_name}',
-                        color=0x1ABC9C
-                    )
-                    full_embed.set_image(url='attachment://full.png')
-                    full_embed.set_footer(text='Thanks for playing! 🔍')
-                    
-                    await puzzle_message.edit(embed=full_embed, attachments=[full_file])
+            # Show full image
+            full_embed, full_file = self.reveal(correct_name, img_data)
+            await puzzle_message.edit(embed=full_embed, attachments=[full_file])
         
         except Exception as e:
             print(f'❌ Error: {e}')
@@ -150,6 +116,8 @@ class Guess(commands.Cog):
             # Remove cooldown on error
             if ctx.author.id in self.cooldowns:
                 del self.cooldowns[ctx.author.id]
+        finally:
+            self.sessions.finish(session, None)
 
 async def setup(bot):
     await bot.add_cog(Guess(bot))
\ No newline at end of file
@@ -1,22 +1,36 @@
 import discord
 from discord.ext import commands
-import firebase_admin
-from firebase_admin import credentials, firestore
-import os
+import asyncio
 from datetime import datetime
+from utils.inbox import InboxRepository
+from utils.metrics import metrics
+
+INBOX_PAGES = metrics.counter('bot_inbox_pages_total', 'Inbox pages shown', labels=('source',))
 
 class Message(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.db = self.init_firebase()
+        self.db = None
+        self.db_task = None
         self.allowed_user_id = 587709425708695552
     
+    async def cog_load(self):
+        # firebase-admin is slow to import, initialize it in the background
+        self.db_task = asyncio.create_task(asyncio.to_thread(self.init_firebase))
+    
+    async def get_db(self):
+        if self.db is None and self.db_task:
+            self.db = await self.db_task
+        return self.db
+    
     def init_firebase(self):
         try:
+            import firebase_admin
+            from firebase_admin import credentials, firestore_async
             if not firebase_admin._apps:
                 cred = credentials.Certificate('data/serviceAccountKey.json')
                 firebase_admin.initialize_app(cred)
-            return firestore.client()
+            return firestore_async.client()
         except Exception as e:
             print(f"Firebase initialization error: {e}")
             return None
@@ -33,6 +47,14 @@ class Message(commands.Cog):
             print(f'Timestamp parse error: {e}')
             return 'Invalid Timestamp'
     
+    def display_row(self, data):
+        """Precompute what the inbox shows for a message, once per fetch"""
+        return {
+            'username': data.get('username', 'Unknown'),
+            'time': self.format_ist(data.get('timestamp')),
+            'message': data.get('message', 'No message content')
+        }
+    
     @commands.command(name='s')
     async def view_messages(self, ctx):
         """View contact messages (owner only)"""
@@ -40,75 +62,90 @@ class Message(commands.Cog):
             await ctx.reply('🚫 WHALES NOT ALLOWED.')
             return
         
-        if not self.db:
+        db = await self.get_db()
+        if not db:
             await ctx.reply('❌ Database not available.')
             return
         
-        # Get messages from Firestore
+        # Fetch only the first page from Firestore
+        repo = InboxRepository(db, per_page=5, format_row=self.display_row)
         try:
-            docs = self.db.collection('contact').order_by('timestamp', direction=firestore.Query.DESCENDING).get()
-            all_messages = [doc.to_dict() for doc in docs]
+            page_messages, has_next = await repo.get_page(0)
+            total = await repo.count()
         except Exception as e:
             await ctx.reply(f'❌ Error fetching messages: {e}')
             return
         
-        if not all_messages:
+        if not page_messages:
             await ctx.reply('📭 No messages found.')
             return
         
         # Pagination setup
         page = 0
         per_page = 5
-        total_pages = (len(all_messages) + per_page - 1) // per_page
+        total_pages = (total + per_page - 1) // per_page if total else None
         
-        view = MessagePaginationView(all_messages, page, per_page, total_pages, self, ctx.author)
+        view = MessagePaginationView(repo, page, per_page, total_pages, self, ctx.author)
+        view.set_page(page_messages, has_next)
         embed = view.generate_embed()
         
         await ctx.reply(embed=embed, view=view)
 
 class MessagePaginationView(discord.ui.View):
-    def __init__(self, messages, page, per_page, total_pages, cog, author):
+    def __init__(self, repo, page, per_page, total_pages, cog, author):
         super().__init__(timeout=300)
-        self.messages = messages
+        self.repo = repo
+        self.page_messages = []
+        self.has_next = False
         self.page = page
         self.per_page = per_page
         self.total_pages = total_pages
         self.cog = cog
         self.author = author
         self.viewing_message = False
+        # page -> (rows, embed, select menu), reused until the page's rows change
+        self.rendered = {}
+        self.build_navigation_buttons()
     
-    def generate_embed(self):
-        if self.viewing_message:
-            return self.current_message_embed
-        
-        start = self.page * self.per_page
-        page_messages = self.messages[start:start + self.per_page]
+    def set_page(self, page_messages, has_next):
+        if page_messages is not self.page_messages:
+            self.page_messages = page_messages
+            cached = self.rendered.get(self.page)
+            if cached and cached[0] is not page_messages:
+                del self.rendered[self.page]
+        self.has_next = has_next
+        self.clear_items()
+        self.add_navigation_buttons()
+        self.add_item(self.generate_select_menu())
+    
+    def page_label(self):
+        if self.total_pages:
+            return f'Page {self.page + 1} of {self.total_pages}'
+        return f'Page {self.page + 1}'
+    
+    def render_page(self):
+        """Embed and select menu for the current page, built once per page"""
+        cached = self.rendered.get(self.page)
+        if cached and cached[0] is self.page_messages:
+            return cached[1], cached[2]
         
         embed = discord.Embed(
             title='📩 Contact Messages',
             color=0x5865F2
         )
-        embed.set_footer(text=f'Page {self.page + 1} of {self.total_pages}')
+        embed.set_footer(text=self.page_label())
         
-        for msg in page_messages:
+        options = []
+        for i, row in enumerate(self.page_messages):
             embed.add_field(
-                name=msg.get('username', 'Unknown'),
-                value=self.cog.format_ist(msg.get('timestamp')),
+                name=row['username'],
+                value=row['time'],
                 inline=False
             )
-        
-        return embed
-    
-    def generate_select_menu(self):
-        start = self.page * self.per_page
-        page_messages = self.messages[start:start + self.per_page]
-        
-        options = []
-        for i, msg in enumerate(page_messages):
             options.append(discord.SelectOption(
-                label=msg.get('username', 'Unknown'),
-                description=self.cog.format_ist(msg.get('timestamp')),
-                value=str(start + i)
+                label=row['username'],
+                description=row['time'],
+                value=str(i)
             ))
         
         select = discord.ui.Select(
@@ -116,7 +153,16 @@ class MessagePaginationView(discord.ui.View):
             options=options
         )
         select.callback = self.select_callback
-        return select
+        self.rendered[self.page] = (self.page_messages, embed, select)
+        return embed, select
+    
+    def generate_embed(self):
+        if self.viewing_message:
+            return self.current_message_embed
+        return self.render_page()[0]
+    
+    def generate_select_menu(self):
+        return self.render_page()[1]
     
     async def select_callback(self, interaction):
         if interaction.user != self.author:
@@ -124,66 +170,76 @@ class MessagePaginationView(discord.ui.View):
             return
         
         index = int(interaction.values[0])
-        data = self.messages[index]
+        row = self.page_messages[index]
         
         self.current_message_embed = discord.Embed(
-            title=f'📨 Message from {data.get("username", "Unknown")}',
-            description=data.get('message', 'No message content'),
+            title=f'📨 Message from {row["username"]}',
+            description=row['message'],
             color=0x00FF00
         )
-        self.current_message_embed.set_footer(text=self.cog.format_ist(data.get('timestamp')))
+        self.current_message_embed.set_footer(text=row['time'])
         
         self.viewing_message = True
         self.clear_items()
-        self.add_item(self.back_button())
+        self.add_item(self.back_btn)
         
         await interaction.response.edit_message(embed=self.current_message_embed, view=self)
     
-    def back_button(self):
-        button = discord.ui.Button(label='🔙 Back', style=discord.ButtonStyle.primary)
-        button.callback = self.back_callback
-        return button
-    
     async def back_callback(self, interaction):
         if interaction.user != self.author:
             await interaction.response.send_message('Not for you.', ephemeral=True)
             return
         
         self.viewing_message = False
-        self.clear_items()
-        self.add_navigation_buttons()
-        self.add_item(self.generate_select_menu())
+        self.set_page(self.page_messages, self.has_next)
         
         await interaction.response.edit_message(embed=self.generate_embed(), view=self)
     
+    def build_navigation_buttons(self):
+        # First, Previous, Next, Last and Back buttons, created once per view
+        self.first_btn = discord.ui.Button(label='⏮️', style=discord.ButtonStyle.secondary)
+        self.prev_btn = discord.ui.Button(label='⬅️', style=discord.ButtonStyle.secondary)
+        self.next_btn = discord.ui.Button(label='➡️', style=discord.ButtonStyle.secondary)
+        self.last_btn = discord.ui.Button(label='⏭️', style=discord.ButtonStyle.secondary)
+        self.back_btn = discord.ui.Button(label='🔙 Back', style=discord.ButtonStyle.primary)
+        
+        self.first_btn.callback = lambda i: self.navigate_callback(i, 0)
+        self.prev_btn.callback = lambda i: self.navigate_callback(i, max(0, self.page - 1))
+        self.next_btn.callback = lambda i: self.navigate_callback(i, self.page + 1 if self.has_next else self.page)
+        self.last_btn.callback = lambda i: self.navigate_callback(i, self.total_pages - 1 if self.total_pages else self.page)
+        self.back_btn.callback = self.back_callback
+    
     def add_navigation_buttons(self):
-        # First, Previous, Next, Last buttons
-        first_btn = discord.ui.Button(label='⏮️', style=discord.ButtonStyle.secondary)
-        prev_btn = discord.ui.Button(label='⬅️', style=discord.ButtonStyle.secondary)
-        next_btn = discord.ui.Button(label='➡️', style=discord.ButtonStyle.secondary)
-        last_btn = discord.ui.Button(label='⏭️', style=discord.ButtonStyle.secondary)
-        
-        first_btn.callback = lambda i: self.navigate_callback(i, 0)
-        prev_btn.callback = lambda i: self.navigate_callback(i, max(0, self.page - 1))
-        next_btn.callback = lambda i: self.navigate_callback(i, min(self.total_pages - 1, self.page + 1))
-        last_btn.callback = lambda i: self.navigate_callback(i, self.total_pages - 1)
-        
-        self.add_item(first_btn)
-        self.add_item(prev_btn)
-        self.add_item(next_btn)
-        self.add_item(last_btn)
+        self.first_btn.disabled = self.prev_btn.disabled = self.page == 0
+        self.next_btn.disabled = not self.has_next
+        self.last_btn.disabled = not self.has_next or not self.total_pages
+        
+        self.add_item(self.first_btn)
+        self.add_item(self.prev_btn)
+        self.add_item(self.next_btn)
+        self.add_item(self.last_btn)
     
     async def navigate_callback(self, interaction, new_page):
         if interaction.user != self.author:
             await interaction.response.send_message('Not for you.', ephemeral=True)
             return
         
+        cached = self.repo.cached_page(new_page)
+        INBOX_PAGES.inc(1, 'cache' if cached else 'firestore')
+        if cached:
+            page_messages, has_next = cached
+        else:
+            await interaction.response.defer()
+            page_messages, has_next = await self.repo.get_page(new_page)
+        if not page_messages:
+            return
         self.page = new_page
-        self.clear_items()
-        self.add_navigation_buttons()
-        self.add_item(self.generate_select_menu())
+        self.set_page(page_messages, has_next)
         
-        await interaction.response.edit_message(embed=self.generate_embed(), view=self)
+        if interaction.response.is_done():
+            await interaction.edit_original_response(embed=self.generate_embed(), view=self)
+        else:
+            await interaction.response.edit_message(embed=self.generate_embed(), view=self)
 
 async def setup(bot):
     await bot.add_cog(Message(bot))
\ No newline at end of file
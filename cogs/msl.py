@@ -1,11 +1,26 @@
 import discord
 from discord.ext import commands
-import asyncio
+from utils.invite_cache import InviteCache
 
 class MSL(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.owner_id = 587709425708695552
+        self.invites = InviteCache(bot)
+    
+    async def cog_load(self):
+        self.invites.start()
+    
+    async def cog_unload(self):
+        await self.invites.close()
+    
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild):
+        self.invites.resolve(guild)
+    
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        self.invites.forget(guild.id)
     
     @commands.command(name='sl', aliases=['msl'])
     async def server_list(self, ctx):
@@ -18,14 +33,15 @@ class MSL(commands.Cog):
         page = 0
         total_pages = (len(guilds) + per_page - 1) // per_page
         
-        view = ServerListView(guilds, page, per_page, total_pages, ctx.author)
+        view = ServerListView(guilds, page, per_page, total_pages, ctx.author, self.invites)
         embed = await view.generate_embed()
         
         await ctx.reply(embed=embed, view=view)
 
 class ServerListView(discord.ui.View):
-    def __init__(self, guilds, page, per_page, total_pages, author):
+    def __init__(self, guilds, page, per_page, total_pages, author, invites):
         super().__init__(timeout=30)
+        self.invites = invites
         self.guilds = guilds
         self.page = page
         self.per_page = per_page
@@ -43,25 +59,17 @@ class ServerListView(discord.ui.View):
         )
         embed.set_footer(text=f'Page {self.page + 1} of {self.total_pages}')
         
+        # Only guilds the background task hasn't resolved yet cost API calls
+        await self.invites.resolve_many(page_guilds, timeout=2.5)
+        
         for i, guild in enumerate(page_guilds):
-            invite = '❌ No invite could be created'
-            
-            try:
-                # Find a channel where bot can create invites
-                for channel in guild.text_channels:
-                    if channel.permissions_for(guild.me).create_instant_invite:
-                        try:
-                            invite_obj = await channel.create_invite(
-                                max_age=0,
-                                max_uses=0,
-                                reason='Auto-generated for bot owner'
-                            )
-                            invite = f'[link]({invite_obj.url})'
-                            break
-                        except:
-                            continue
-            except:
-                invite = '❌ Failed to fetch invite'
+            entry = self.invites.get(guild.id)
+            if entry is None:
+                invite = '⏳ Invite still resolving'
+            elif entry['url']:
+                invite = f'[link]({entry["url"]})'
+            else:
+                invite = '❌ No invite could be created'
             
             embed.add_field(
                 name=f'{start + i + 1}. {guild.name}',
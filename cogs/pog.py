@@ -1,50 +1,78 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-import re
-import aiohttp
-import easyocr
-import cv2
-import numpy as np
 import asyncio
-from fuzzywuzzy import fuzz
+import os
+import time
 from config.database import mongodb
+from config.guild_config import GuildConfigCache
+from config.migrate import reconcile_legacy_config
+from utils.http_client import http_client
+from utils.lifecycle import lifecycle
+from utils.metrics import metrics
+from utils.ocr import read_rois_batch, decode_text_band
+from utils.sofi_parser import find_pog_cards
+from utils.ocr_cache import OCRCache, content_digest
+from utils.ocr_pool import OCRPool, OCRJobDropped
+from utils.fuzzy_match import best_match
+
+PARSE_SECONDS = metrics.histogram('bot_drop_parse_seconds', 'POG.on_message drop parse time',
+                                  buckets=(0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.005))
+# Measured around the pool call, so it includes queue wait and worker IPC, not just the model
+OCR_ROI_LATENCY_SECONDS = metrics.histogram('bot_ocr_roi_latency_seconds',
+                                            'OCR pool latency per ROI: queue wait + IPC + OCR (request time / ROIs in request)',
+                                            labels=('field',))
+OCR_DROP_SECONDS = metrics.histogram('bot_ocr_drop_seconds', 'OCR verification time per drop')
+OCR_ROIS = metrics.counter('bot_ocr_rois_total', 'Drop ROIs by how they were resolved', labels=('source',))
 
 class POG(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.ATTACHMENT_BOT_ID = 853629533855809596
-        self.config_cache = {}  # Cache server configs
-        use_gpu = False
+        self.config_cache = GuildConfigCache()  # Cache server configs
+        self.ocr_pool = OCRPool()
+        self.ocr_stats = {'drops': 0, 'verified': 0, 'rois_read': 0, 'rois_cached': 0, 'rois_skipped': 0}
+        self.ocr_cache = OCRCache()
+        metrics.gauge('bot_ocr_queue_depth', 'OCR jobs waiting for a worker', func=self.ocr_pool.queue_depth)
+        metrics.gauge('bot_ocr_cache_hit_ratio', 'OCR result cache hit ratio', func=self.ocr_cache.hit_rate)
+        metrics.gauge('bot_guild_config_cache_hit_ratio', 'Guild config cache hit ratio', func=self.config_cache.hit_rate)
+        print(f'🚀 POG detection with OCR ({self.ocr_pool.workers} workers)')
+
+    async def cog_load(self):
+        self.ocr_pool.start()
+        # Config preload and OCR model loading run in the background so they don't delay startup
+        self.warm_task = lifecycle.create_task(self.warm_up())
+
+    async def warm_up(self):
+        # A failed legacy import must not stop the preload, the cache still works from Mongo
         try:
-            import torch
-            use_gpu = torch.cuda.is_available()
-        except:
-            pass
+            await reconcile_legacy_config()
+        except Exception as e:
+            print(f'❌ Legacy config reconcile failed: {e}')
+        try:
+            await self.config_cache.preload()
+        except Exception as e:
+            print(f'❌ Guild config preload failed: {e}')
+        if os.getenv('CONFIG_CHANGE_STREAM') == '1':
+            self.config_cache.start_watch()
+        try:
+            await self.ocr_pool.warm_up()
+            print('🔥 OCR workers warmed up')
+        except Exception as e:
+            print(f'❌ OCR warm-up failed: {e}')
 
-        self.ocr_reader = easyocr.Reader(['en'], gpu=use_gpu)
-        print(f'🚀 POG detection with OCR (GPU={use_gpu})')
+    async def cog_unload(self):
+        self.warm_task.cancel()
+        await self.config_cache.close()
+        await self.ocr_pool.close()
 
     async def get_server_config(self, guild_id):
         """Get server configuration with caching"""
-        guild_str = str(guild_id)
-        if guild_str in self.config_cache:
-            return self.config_cache[guild_str]
-        collection = mongodb.get_collection('servers')
-        config = await collection.find_one({'guild_id': guild_str})
-        result = config if config else {}
-        self.config_cache[guild_str] = result
-        return result
+        return await self.config_cache.get(guild_id)
 
     async def save_server_config(self, guild_id, target_channel_id):
-        """Save server configuration to MongoDB"""
-        collection = mongodb.get_collection('servers')
-        await collection.update_one(
-            {'guild_id': str(guild_id)},
-            {'$set': {'guild_id': str(guild_id), 'targetChannelId': target_channel_id}},
-            upsert=True
-        )
-        self.config_cache[str(guild_id)] = {'guild_id': str(guild_id), 'targetChannelId': target_channel_id}
+        """Save server configuration to MongoDB (write-through)"""
+        await self.config_cache.save(guild_id, target_channel_id)
 
     @app_commands.command(name="setchannel", description="Set the target channel for POG alerts")
     async def set_channel(self, interaction: discord.Interaction, channelid: str):
@@ -66,29 +94,16 @@ class POG(commands.Cog):
             not message.content or
             '<:noriclock:' in message.content):
             return
+        with PARSE_SECONDS.time():
+            pog_cards = find_pog_cards(message.content)
+        if not pog_cards:
+            return
         guild_id = str(message.guild.id)
         config = await self.get_server_config(guild_id)
         if not config or 'targetChannelId' not in config:
             return
-        content = message.content
-        if ('0]' in content or
-            not any(x in content for x in ['1]', '2]', '3]'])):
-            return
-        pog_cards = []
-        for line in content.split('\n'):
-            if not re.match(r'^`?[123]\]', line.strip()):
-                continue
-            heart_match = re.search(r':heart:\s+`(\d+)', line)
-            gid_match = re.search(r'`ɢ\s*(\d+)', line)
-            name_match = re.search(r'`[0-9]+\]\s+.+?•\s+\*\*(.+?)\*\*', line)
-            hearts = int(heart_match.group(1)) if heart_match else 0
-            gid = int(gid_match.group(1)) if gid_match else None
-            card_name = name_match.group(1).strip() if name_match else None
-            if hearts > 99 or (gid and gid < 100):
-                pog_cards.append({'name': card_name, 'gid': gid, 'hearts': hearts})
-        if pog_cards:
-            print(f'🎯 POG detected! Cards: {pog_cards}')
-            await self.handle_pog(message, int(config['targetChannelId']), pog_cards, guild_id)
+        print(f'🎯 POG detected! Cards: {pog_cards}')
+        await self.handle_pog(message, int(config['targetChannelId']), pog_cards, guild_id)
 
     async def handle_pog(self, message, target_channel_id, pog_cards, guild_id):
         first_image = None
@@ -110,75 +125,99 @@ class POG(commands.Cog):
             await message.channel.send(f'🎉 {mentioned_user.mention if mentioned_user else "<@853629533855809596>"} Pogged! Check it out in <#{target_channel_id}>')
         except:
             pass
-        asyncio.create_task(self.verify_and_send_embed(
+        lifecycle.create_task(self.verify_and_send_embed(
             target_channel_id, first_image, mentioned_user, message, pog_cards
         ))
 
-    def extract_card_fields_from_image(self, img, card_count=3):
+    async def verify_cards(self, url, pog_cards, card_count=3):
         """
-        Extracts name, series, and gen for up to 3 cards using nori repo's coordinates.
-        Returns: List of dicts: {'card': idx, 'name': str, 'series': str, 'gen': str}
+        Lazy OCR verification: reads only the boxes a check needs, cheapest first
+        (gen boxes for cards with a gid, then name boxes) and stops at the first
+        verified card. Series boxes are never read. Texts already in the OCR
+        cache (same URL or byte-identical image) are reused, the image is only
+        downloaded when some box still has to be read and only decoded when
+        the cache does not have it either.
+        Returns the verified pog card or None.
         """
-        # nori repo coordinates for Sofi drop (name, series, gen for 3 cards)
-        coords = [
-            # Card 1
-            (12, 458, 290, 26),    # name
-            (12, 487, 290, 26),    # series
-            (36, 427, 108, 26),    # gen
-            # Card 2
-            (361, 458, 290, 26),   # name
-            (361, 487, 290, 26),   # series
-            (385, 427, 108, 26),   # gen
-            # Card 3
-            (704, 458, 290, 26),   # name
-            (704, 487, 290, 26),   # series
-            (728, 427, 108, 26),   # gen
+        started = time.perf_counter()
+        rois_read = 0
+        rois_cached = 0
+        verified_card = None
+        known = self.ocr_cache.get_by_url(url) or {}
+        image_data = None
+        digest = None
+        band = None
+        stages = [
+            ('gen', [card for card in pog_cards if card['gid']]),
+            ('name', [card for card in pog_cards if card['name']]),
         ]
-        results = []
-        for idx in range(card_count):
-            name_roi = img[coords[idx*3+0][1]:coords[idx*3+0][1]+coords[idx*3+0][3], coords[idx*3+0][0]:coords[idx*3+0][0]+coords[idx*3+0][2]]
-            name_text = ' '.join([t[1] for t in self.ocr_reader.readtext(name_roi)]).strip()
-            series_roi = img[coords[idx*3+1][1]:coords[idx*3+1][1]+coords[idx*3+1][3], coords[idx*3+1][0]:coords[idx*3+1][0]+coords[idx*3+1][2]]
-            series_text = ' '.join([t[1] for t in self.ocr_reader.readtext(series_roi)]).strip()
-            gen_roi = img[coords[idx*3+2][1]:coords[idx*3+2][1]+coords[idx*3+2][3], coords[idx*3+2][0]:coords[idx*3+2][0]+coords[idx*3+2][2]]
-            gen_text = ' '.join([t[1] for t in self.ocr_reader.readtext(gen_roi)]).strip()
-            results.append({'card': idx+1, 'name': name_text, 'series': series_text, 'gen': gen_text})
-        return results
+        for field, cards in stages:
+            if not cards:
+                continue
+            keys = sorted({(card['card'], field) for card in cards})
+            missing = [key for key in keys if key not in known]
+            if missing and image_data is None:
+                image_data = await http_client.fetch_bytes(url)
+                digest = content_digest(image_data)
+                known = {**(self.ocr_cache.get_by_hash(digest, url) or {}), **known}
+                missing = [key for key in keys if key not in known]
+            if missing and band is None:
+                band = await asyncio.to_thread(decode_text_band, image_data)
+                if band is None:
+                    return None
+            rois_cached += len(keys) - len(missing)
+            if missing:
+                ocr_started = time.perf_counter()
+                texts = await self.ocr_pool.run_batched(read_rois_batch, (band, missing))
+                per_roi = (time.perf_counter() - ocr_started) / len(missing)
+                for _ in missing:
+                    OCR_ROI_LATENCY_SECONDS.observe(per_roi, field)
+                rois_read += len(missing)
+                known.update(texts)
+                self.ocr_cache.put(url, digest, texts)
+            texts = {key: known[key] for key in keys}
+            print(f'OCR {field} fields:', texts)
+            if field == 'gen':
+                read = set(texts.values())
+                verified_card = next((card for card in cards if str(card['gid']) in read), None)
+                if verified_card:
+                    print(f'✅ OCR gen matched: {verified_card["gid"]}')
+            else:
+                # Every card name against every name box in one batch, best pair wins
+                read = list(texts.values())
+                match = best_match([card['name'] for card in cards], read, threshold=70)
+                if match:
+                    verified_card = cards[match[0]]
+                    print(f'✅ OCR name matched: {verified_card["name"]} ~ {read[match[1]]} ({match[2]:.0f})')
+            if verified_card:
+                break
+
+        OCR_DROP_SECONDS.observe(time.perf_counter() - started)
+        OCR_ROIS.inc(rois_read, 'ocr')
+        OCR_ROIS.inc(rois_cached, 'cache')
+        rois_skipped = card_count * 3 - rois_read - rois_cached
+        OCR_ROIS.inc(rois_skipped, 'skipped')
+        self.ocr_stats['drops'] += 1
+        self.ocr_stats['rois_read'] += rois_read
+        self.ocr_stats['rois_cached'] += rois_cached
+        self.ocr_stats['rois_skipped'] += rois_skipped
+        if verified_card:
+            self.ocr_stats['verified'] += 1
+        print(f'🔎 OCR read {rois_read}/{card_count * 3} ROIs for this drop '
+              f'({rois_cached} cached, cache hit rate {self.ocr_cache.hit_rate():.0%})')
+        return verified_card
 
     async def verify_and_send_embed(self, target_channel_id, first_image, mentioned_user, message, pog_cards):
         """
         OCR verification: succeeds if any card matches, sends embed, skips further checks
         """
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(first_image['imageUrl']) as response:
-                    image_data = await response.read()
-            nparr = np.frombuffer(image_data, np.uint8)
-            img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-            if img is None:
+            try:
+                verified_card = await self.verify_cards(first_image['imageUrl'], pog_cards)
+            except OCRJobDropped:
+                print('⚠️ OCR queue full - dropped stale verification')
                 return
-
-            # Extract name, series, gen using nori coordinates
-            card_fields = self.extract_card_fields_from_image(img, card_count=3)
-            print("Extracted card fields:", card_fields)
-
-            verified = False
-            verified_card = None
-            for card in pog_cards:
-                for field in card_fields:
-                    # Name fuzzy match or gen exact match
-                    if card['name'] and fuzz.partial_ratio(card['name'].lower(), field['name'].lower()) > 70:
-                        print(f'✅ OCR name matched: {card["name"]} ~ {field["name"]}')
-                        verified = True
-                        verified_card = card
-                        break
-                    if card['gid'] and str(card['gid']) == field['gen']:
-                        print(f'✅ OCR gen matched: {card["gid"]} ~ {field["gen"]}')
-                        verified = True
-                        verified_card = card
-                        break
-                if verified:
-                    break  # Exit outer loop as soon as one card is verified
+            verified = verified_card is not None
 
             if verified:
                 embed = discord.Embed(
@@ -204,15 +243,8 @@ class POG(commands.Cog):
 
     def clear_cache(self):
         """Clear config cache"""
-        self.config_cache.clear()
+        self.config_cache.invalidate()
 
 async def setup(bot):
-    await mongodb.connect()
-    pog_cog = POG(bot)
-    await bot.add_cog(pog_cog)
-    import asyncio
-    async def cache_cleaner():
-        while True:
-            await asyncio.sleep(300)
-            pog_cog.clear_cache()
-    asyncio.create_task(cache_cleaner())
\ No newline at end of file
+    await lifecycle.acquire('mongodb', mongodb.connect, mongodb.close)
+    await bot.add_cog(POG(bot))
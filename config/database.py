@@ -10,7 +10,9 @@ class MongoDB:
         self.db = None
         
     async def connect(self):
-        """Connect to MongoDB with optimized settings"""
+        """Connect to MongoDB with optimized settings (no-op if already connected)"""
+        if self.client is not None:
+            return
         try:
             self.client = AsyncIOMotorClient(
                 os.getenv('MONGO_URI'),
@@ -28,6 +30,8 @@ class MongoDB:
         """Close MongoDB connection"""
         if self.client:
             self.client.close()
+            self.client = None
+            self.db = None
             print("🔌 MongoDB connection closed")
     
     def get_collection(self, collection_name):
@@ -0,0 +1,155 @@
+import asyncio
+import os
+import random
+import time
+from pymongo import ReturnDocument
+from pymongo.errors import OperationFailure
+from config.database import mongodb
+from utils.metrics import metrics
+
+MONGO_SECONDS = metrics.histogram('bot_mongo_query_seconds', 'MongoDB query latency', labels=('operation',))
+CONFIG_LOOKUPS = metrics.counter('bot_guild_config_lookups_total', 'Guild config cache lookups', labels=('result',))
+# ChangeStreamFatalError / ChangeStreamHistoryLost: the resume token can't be used anymore
+UNRESUMABLE_CODES = (280, 286)
+
+class GuildConfigCache:
+    """
+    Guild config cache over the Mongo 'servers' collection.
+    - bulk preload of every document in one cursor at startup
+    - per-entry TTL (with jitter) instead of a global flush
+    - negative caching for guilds without a config
+    - write-through on save, optional change stream to pick up outside edits
+    """
+    def __init__(self, collection_name='servers', ttl=None, negative_ttl=None):
+        self.collection_name = collection_name
+        self.ttl = ttl or int(os.getenv('CONFIG_CACHE_TTL', 900))
+        self.negative_ttl = negative_ttl or int(os.getenv('CONFIG_CACHE_NEGATIVE_TTL', 300))
+        self.entries = {}  # guild_id str -> (config dict, expires)
+        self.doc_ids = {}  # Mongo _id -> guild_id str, for change stream deletes
+        self.pending = {}  # guild_id str -> in-flight lookup future
+        self.watch_task = None
+        self.stats = {'hits': 0, 'negative_hits': 0, 'misses': 0, 'preloaded': 0, 'change_events': 0, 'watch_restarts': 0}
+
+    def get_collection(self):
+        return mongodb.get_collection(self.collection_name)
+
+    def _expiry(self, ttl):
+        return time.monotonic() + ttl * random.uniform(0.9, 1.1)
+
+    def _store(self, guild_str, config):
+        if config:
+            if config.get('_id') is not None:
+                self.doc_ids[config['_id']] = guild_str
+            self.entries[guild_str] = (config, self._expiry(self.ttl))
+        else:
+            self.entries[guild_str] = ({}, self._expiry(self.negative_ttl))
+
+    async def preload(self):
+        """Load every guild config in a single cursor"""
+        count = 0
+        with MONGO_SECONDS.time('servers.preload'):
+            async for doc in self.get_collection().find({}):
+                if doc.get('guild_id'):
+                    self._store(str(doc['guild_id']), doc)
+                    count += 1
+        self.stats['preloaded'] = count
+        print(f'⚙️ Preloaded {count} guild configs')
+
+    async def get(self, guild_id):
+        """Guild config dict, {} when the guild has none"""
+        guild_str = str(guild_id)
+        entry = self.entries.get(guild_str)
+        if entry and entry[1] > time.monotonic():
+            self.stats['hits' if entry[0] else 'negative_hits'] += 1
+            CONFIG_LOOKUPS.inc(1, 'hit' if entry[0] else 'negative_hit')
+            return entry[0]
+        self.stats['misses'] += 1
+        CONFIG_LOOKUPS.inc(1, 'miss')
+        # Collapse concurrent lookups for the same guild into one query
+        if guild_str in self.pending:
+            return await asyncio.shield(self.pending[guild_str])
+        future = asyncio.get_running_loop().create_future()
+        self.pending[guild_str] = future
+        try:
+            with MONGO_SECONDS.time('servers.find_one'):
+                config = await self.get_collection().find_one({'guild_id': guild_str})
+            self._store(guild_str, config or {})
+            future.set_result(config or {})
+            return config or {}
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()
+            raise
+        finally:
+            del self.pending[guild_str]
+
+    async def save(self, guild_id, target_channel_id):
+        """Write-through update of a guild's target channel"""
+        guild_str = str(guild_id)
+        # Returns the stored document, so its _id is known for change stream deletes
+        with MONGO_SECONDS.time('servers.find_one_and_update'):
+            config = await self.get_collection().find_one_and_update(
+                {'guild_id': guild_str},
+                {'$set': {'guild_id': guild_str, 'targetChannelId': target_channel_id}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+        self._store(guild_str, config or {'guild_id': guild_str, 'targetChannelId': target_channel_id})
+
+    def invalidate(self, guild_id=None):
+        if guild_id is None:
+            self.entries.clear()
+        else:
+            self.entries.pop(str(guild_id), None)
+
+    def start_watch(self):
+        """Follow the collection's change stream (needs a replica set, enabled by CONFIG_CHANGE_STREAM=1)"""
+        if self.watch_task is None or self.watch_task.done():
+            self.watch_task = asyncio.create_task(self._watch())
+
+    def _apply_change(self, change):
+        self.stats['change_events'] += 1
+        doc = change.get('fullDocument')
+        if doc and doc.get('guild_id'):
+            self._store(str(doc['guild_id']), doc)
+        elif change.get('operationType') == 'delete':
+            guild_str = self.doc_ids.pop(change['documentKey']['_id'], None)
+            if guild_str:
+                self._store(guild_str, {})
+
+    async def _watch(self):
+        """Change stream loop, resumes from the last seen event after errors (stepdowns, network blips)"""
+        resume_token = None
+        delay = 1
+        while True:
+            try:
+                async with self.get_collection().watch(full_document='updateLookup', resume_after=resume_token) as stream:
+                    print('👀 Watching guild config changes')
+                    delay = 1
+                    async for change in stream:
+                        self._apply_change(change)
+                        resume_token = stream.resume_token
+                # The server closed the stream (collection dropped or renamed), the old token can't resume it
+                resume_token = None
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if isinstance(e, OperationFailure) and e.code in UNRESUMABLE_CODES:
+                    # Events were lost, start a fresh stream and let entries reload from Mongo
+                    resume_token = None
+                    self.invalidate()
+                self.stats['watch_restarts'] += 1
+                print(f'❌ Guild config change stream failed: {e}, restarting in {delay}s')
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 60)
+
+    async def close(self):
+        if self.watch_task:
+            self.watch_task.cancel()
+            await asyncio.gather(self.watch_task, return_exceptions=True)
+            self.watch_task = None
+
+    def hit_rate(self):
+        hits = self.stats['hits'] + self.stats['negative_hits']
+        total = hits + self.stats['misses']
+        return hits / total if total else 0.0
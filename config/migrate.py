@@ -0,0 +1,128 @@
+"""
+Import/export between the legacy data/config.json and the Mongo 'servers' collection.
+
+    python -m config.migrate import [path] [--overwrite]
+    python -m config.migrate export [path]
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from pymongo import UpdateOne
+from config.database import mongodb
+
+LEGACY_CONFIG_PATH = 'data/config.json'
+BATCH_SIZE = 500
+LEGACY_MIGRATION_ID = 'legacy_config_import'
+
+def normalize_legacy(data):
+    """
+    Legacy {guild_id: {'targetChannelId': id}} map -> [(guild_id str, channel_id int)].
+    Skips keys that are not guild ids (like the stray top-level targetChannelId)
+    and entries whose ids are not numeric.
+    """
+    entries = []
+    for guild_id, value in data.items():
+        guild_str = str(guild_id).strip()
+        if not guild_str.isdigit() or not isinstance(value, dict):
+            continue
+        channel_id = str(value.get('targetChannelId', '')).strip()
+        if not channel_id.isdigit():
+            continue
+        entries.append((guild_str, int(channel_id)))
+    return entries
+
+def load_legacy(path=LEGACY_CONFIG_PATH):
+    try:
+        with open(path, 'r') as f:
+            return normalize_legacy(json.load(f))
+    except FileNotFoundError:
+        return []
+
+async def ensure_indexes(collection):
+    """Unique index so every guild lookup is a single indexed query"""
+    await collection.create_index('guild_id', unique=True)
+
+async def import_entries(collection, entries, overwrite=False, batch_size=BATCH_SIZE):
+    """
+    Upsert (guild_id, channel_id) pairs in bulk_write batches.
+    Without overwrite, guilds that already have a Mongo config keep it.
+    Returns the number of inserted + modified documents.
+    """
+    operator = '$set' if overwrite else '$setOnInsert'
+    changed = 0
+    for start in range(0, len(entries), batch_size):
+        batch = entries[start:start + batch_size]
+        result = await collection.bulk_write([
+            UpdateOne(
+                {'guild_id': guild_id},
+                {operator: {'targetChannelId': channel_id}},
+                upsert=True
+            )
+            for guild_id, channel_id in batch
+        ], ordered=False)
+        changed += result.upserted_count + result.modified_count
+    return changed
+
+async def export_entries(collection, path):
+    """Write every Mongo guild config back out in the legacy format"""
+    data = {}
+    async for doc in collection.find({}, {'_id': 0, 'guild_id': 1, 'targetChannelId': 1}):
+        if doc.get('guild_id') and doc.get('targetChannelId'):
+            data[str(doc['guild_id'])] = {'targetChannelId': str(doc['targetChannelId'])}
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+    return len(data)
+
+async def reconcile_legacy_config(path=LEGACY_CONFIG_PATH):
+    """
+    Startup step: index the collection and import the legacy guilds once.
+    A marker in the 'migrations' collection records the import, so guilds
+    deleted from Mongo later are not brought back from the legacy file on
+    the next boot. Re-importing is left to the CLI.
+    """
+    collection = mongodb.get_collection('servers')
+    try:
+        await ensure_indexes(collection)
+    except Exception as e:
+        print(f'❌ Could not create guild_id index: {e}')
+    migrations = mongodb.get_collection('migrations')
+    if await migrations.find_one({'_id': LEGACY_MIGRATION_ID}):
+        return
+    entries = load_legacy(path)
+    if not entries:
+        return
+    # Concurrent first boots (several shards) are harmless, $setOnInsert keeps existing configs
+    added = await import_entries(collection, entries)
+    await migrations.update_one(
+        {'_id': LEGACY_MIGRATION_ID},
+        {'$setOnInsert': {'path': path, 'entries': len(entries), 'imported_at': time.time()}},
+        upsert=True
+    )
+    if added:
+        print(f'📥 Imported {added} guild configs from {path}')
+
+async def main():
+    parser = argparse.ArgumentParser(description='Import/export guild configs between data/config.json and MongoDB')
+    parser.add_argument('action', choices=['import', 'export'])
+    parser.add_argument('path', nargs='?', default=LEGACY_CONFIG_PATH)
+    parser.add_argument('--overwrite', action='store_true', help='replace existing Mongo configs on import')
+    args = parser.parse_args()
+
+    await mongodb.connect()
+    collection = mongodb.get_collection('servers')
+    try:
+        if args.action == 'import':
+            await ensure_indexes(collection)
+            entries = load_legacy(args.path)
+            changed = await import_entries(collection, entries, overwrite=args.overwrite)
+            print(f'✅ Imported {len(entries)} legacy entries ({changed} changed)')
+        else:
+            count = await export_entries(collection, args.path)
+            print(f'✅ Exported {count} guild configs to {os.path.abspath(args.path)}')
+    finally:
+        await mongodb.close()
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -1,8 +1,14 @@
 import discord
 from discord.ext import commands
 import os
-from dotenv import load_dotenv
+import signal
 import asyncio
+from dotenv import load_dotenv
+from utils.startup import load_cogs
+from utils.lifecycle import lifecycle
+from utils.metrics import MetricsServer, metrics
+from utils.loop_watchdog import watchdog
+from utils.sharding import shard_settings, format_shard_ids, ShardStatus
 
 load_dotenv()
 
@@ -10,31 +16,64 @@ intents = discord.Intents.default()
 intents.message_content = True
 intents.guilds = True
 
-bot = commands.Bot(command_prefix='m', intents=intents)
+COGS = ['cogs.collection','cogs.guess', 'cogs.help', 'cogs.message', 'cogs.pog', 'cogs.dm', 'cogs.msl', 'cogs.debug']
 
-@bot.event
-async def on_ready():
-    print(f'🤖 Logged in as {bot.user}')
-    
-    # Load all cogs
-    cogs = ['cogs.collection','cogs.guess', 'cogs.help', 'cogs.message', 'cogs.pog', 'cogs.dm', 'cogs.msl']
-    for cog in cogs:
+# SHARD_COUNT (a number or 'auto') switches to AutoShardedBot, SHARD_IDS limits
+# this process to a range of shards (see supervisor.py)
+SHARDING = shard_settings()
+
+class Bot(commands.AutoShardedBot if SHARDING else commands.Bot):
+    async def setup_hook(self):
+        # Runs once per process, not on every gateway reconnect like on_ready
+        await lifecycle.acquire('watchdog', watchdog.start, watchdog.close)
+        metrics_server = MetricsServer()
         try:
-            if cog in bot.extensions:
-                await bot.reload_extension(cog)
-                print(f'🔄 Reloaded {cog}')
-            else:
-                await bot.load_extension(cog)
-                print(f'✅ Loaded {cog}')
+            await lifecycle.acquire('metrics', metrics_server.start, metrics_server.close)
         except Exception as e:
-            print(f'❌ Failed to load {cog}: {e}')
+            print(f'❌ Metrics server failed to start: {e}')
+        metrics.gauge('bot_background_tasks', 'Tracked background tasks', func=lambda: len(lifecycle.tasks))
+        
+        self.cog_timings = await load_cogs(self, COGS)
+        
+        # Sync slash commands (once per deployment, by the process that owns shard 0)
+        if not SHARDING or not self.shard_ids or 0 in self.shard_ids:
+            try:
+                synced = await self.tree.sync()
+                print(f'✅ Synced {len(synced)} slash commands')
+            except Exception as e:
+                print(f'❌ Failed to sync commands: {e}')
+        
+        if SHARDING:
+            status = ShardStatus(self)
+            await lifecycle.acquire('shard_status', status.start, status.close)
+        
+        # Graceful shutdown on SIGTERM (container stop), SIGINT is handled by bot.run
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, lambda: asyncio.create_task(self.close()))
+        except (NotImplementedError, RuntimeError):
+            pass
     
-    # Sync slash commands
-    try:
-        synced = await bot.tree.sync()
-        print(f'✅ Synced {len(synced)} slash commands')
-    except Exception as e:
-        print(f'❌ Failed to sync commands: {e}')
+    async def close(self):
+        # Unload cogs first (stops their workers and tasks), then shared resources
+        for extension in list(self.extensions):
+            try:
+                await self.unload_extension(extension)
+            except Exception as e:
+                print(f'❌ Failed to unload {extension}: {e}')
+        await lifecycle.shutdown()
+        await super().close()
+
+if SHARDING:
+    bot = Bot(command_prefix='m', intents=intents, shard_count=SHARDING[0], shard_ids=SHARDING[1])
+else:
+    bot = Bot(command_prefix='m', intents=intents)
+
+@bot.event
+async def on_ready():
+    print(f'🤖 Logged in as {bot.user}')
+    if SHARDING:
+        shard_ids = format_shard_ids(bot.shard_ids or range(bot.shard_count or 1))
+        print(f'🧩 Shards {shard_ids} of {bot.shard_count}, {len(bot.guilds)} guilds')
 
 if __name__ == '__main__':
     bot.run(os.getenv('TOKEN'))
\ No newline at end of file
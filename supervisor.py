@@ -0,0 +1,182 @@
+"""
+Runs the bot as several shard-group processes (python supervisor.py).
+
+SHARD_COUNT   total shards, 'auto' (default) asks Discord for the recommended count
+SHARD_GROUPS  number of processes, defaults to one per CPU core
+Each process gets a contiguous SHARD_IDS range, its own METRICS_PORT
+(base + group) and invite cache file. Crashed processes are restarted with
+exponential backoff, and per-shard latency and guild counts are printed
+every SHARD_REPORT_INTERVAL seconds from the status files the shards write.
+"""
+import asyncio
+import json
+import os
+import signal
+import sys
+import time
+import urllib.request
+from dotenv import load_dotenv
+from utils.sharding import split_shards, format_shard_ids
+
+load_dotenv()
+
+# Shard processes run main.py from the repo root, whatever directory the supervisor was started from
+ROOT = os.path.dirname(os.path.abspath(__file__))
+STATUS_DIR = os.path.join(ROOT, os.getenv('SHARD_STATUS_DIR', 'data/shards'))
+REPORT_INTERVAL = int(os.getenv('SHARD_REPORT_INTERVAL', 60))
+IDENTIFY_DELAY = 5.0  # Discord allows one identify per 5s per concurrency bucket
+
+def fetch_gateway_info(token):
+    """Recommended shard count and identify concurrency from GET /gateway/bot"""
+    request = urllib.request.Request(
+        'https://discord.com/api/v10/gateway/bot',
+        headers={'Authorization': f'Bot {token}', 'User-Agent': 'DiscordBot (supervisor, 1.0)'}
+    )
+    with urllib.request.urlopen(request, timeout=10) as response:
+        data = json.load(response)
+    return data['shards'], data['session_start_limit']['max_concurrency']
+
+async def wait_or_stop(stopping, timeout):
+    """Sleep for timeout seconds, returning early when stopping is set"""
+    try:
+        await asyncio.wait_for(stopping.wait(), timeout=timeout)
+    except asyncio.TimeoutError:
+        pass
+
+class ShardGroup:
+    """One bot process running a range of shards"""
+    def __init__(self, group, shard_ids, env):
+        self.group = group
+        self.shard_ids = shard_ids
+        self.env = env
+        self.process = None
+        self.restarts = 0
+        self.started_at = None
+
+    @property
+    def label(self):
+        return f'group {self.group} (shards {format_shard_ids(self.shard_ids)})'
+
+    async def spawn(self):
+        self.started_at = time.monotonic()
+        self.process = await asyncio.create_subprocess_exec(
+            sys.executable, os.path.join(ROOT, 'main.py'),
+            env=self.env,
+            cwd=ROOT
+        )
+        print(f'🚀 Started {self.label} as pid {self.process.pid}')
+
+    async def run(self, stopping, start_delay=0.0):
+        backoff = 5
+        await wait_or_stop(stopping, start_delay)
+        while not stopping.is_set():
+            await self.spawn()
+            code = await self.process.wait()
+            if stopping.is_set():
+                break
+            uptime = time.monotonic() - self.started_at
+            # A process that stayed up for a while gets a fresh backoff
+            if uptime > 300:
+                backoff = 5
+            self.restarts += 1
+            print(f'💥 {self.label} exited with {code} after {uptime:.0f}s, restarting in {backoff}s')
+            await wait_or_stop(stopping, backoff)
+            backoff = min(backoff * 2, 300)
+
+    async def stop(self, timeout=20):
+        if self.process is None or self.process.returncode is not None:
+            return
+        self.process.terminate()
+        try:
+            await asyncio.wait_for(self.process.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            print(f'⚠️ {self.label} did not stop in {timeout}s, killing it')
+            self.process.kill()
+            await self.process.wait()
+
+def read_status(group):
+    try:
+        with open(os.path.join(STATUS_DIR, f'{group.group}.json'), 'r') as f:
+            return json.load(f)
+    except:
+        return None
+
+def report(groups):
+    total_guilds = 0
+    lines = []
+    for group in groups:
+        status = read_status(group)
+        alive = group.process is not None and group.process.returncode is None
+        if not status or not alive:
+            state = 'waiting' if group.process is None else 'starting' if alive else 'down'
+            lines.append(f'  {group.label}: {state}, {group.restarts} restarts')
+            continue
+        age = time.time() - status['updated']
+        for shard_id, shard in status['shards'].items():
+            latency = f'{shard["latency"] * 1000:.0f}ms' if shard['latency'] is not None else 'n/a'
+            total_guilds += shard['guilds']
+            lines.append(f'  shard {shard_id}: {latency}, {shard["guilds"]} guilds')
+        lines.append(f'  {group.label}: pid {status["pid"]}, updated {age:.0f}s ago, {group.restarts} restarts')
+    print(f'📊 Shards report: {total_guilds} guilds')
+    print('\n'.join(lines))
+
+async def report_loop(groups, stopping):
+    while not stopping.is_set():
+        await wait_or_stop(stopping, REPORT_INTERVAL)
+        if not stopping.is_set():
+            report(groups)
+
+async def main():
+    token = os.getenv('TOKEN')
+    count = os.getenv('SHARD_COUNT', 'auto')
+    max_concurrency = 1
+    if count == 'auto':
+        shard_count, max_concurrency = await asyncio.to_thread(fetch_gateway_info, token)
+        print(f'🧩 Discord recommends {shard_count} shards')
+    else:
+        shard_count = int(count)
+    cpu_count = os.cpu_count() or 1
+    ranges = split_shards(shard_count, int(os.getenv('SHARD_GROUPS', cpu_count)))
+    metrics_port = int(os.getenv('METRICS_PORT', 9108))
+
+    groups = []
+    delay = 0.0
+    delays = []
+    for group, shard_ids in enumerate(ranges):
+        env = dict(os.environ)
+        env.update({
+            'SHARD_COUNT': str(shard_count),
+            'SHARD_IDS': format_shard_ids(shard_ids),
+            'SHARD_GROUP': str(group),
+            'SHARD_STATUS_DIR': STATUS_DIR,
+            'METRICS_PORT': str(metrics_port + group) if metrics_port else '0',
+            'INVITE_CACHE_PATH': f'data/invite_cache.{group}.json',
+            # Split the cores between the groups' OCR pools
+            'OCR_WORKERS': os.getenv('OCR_WORKERS', str(max(1, cpu_count // len(ranges)))),
+        })
+        groups.append(ShardGroup(group, shard_ids, env))
+        # Stagger start-up so the groups' identifies do not collide
+        delays.append(delay)
+        delay += IDENTIFY_DELAY * len(shard_ids) / max_concurrency
+    print(f'🧩 Running {shard_count} shards in {len(groups)} processes')
+
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(sig, stopping.set)
+        except NotImplementedError:
+            pass
+
+    runners = [asyncio.create_task(group.run(stopping, delays[i])) for i, group in enumerate(groups)]
+    reporter = asyncio.create_task(report_loop(groups, stopping))
+    await stopping.wait()
+    print('🛑 Stopping shard groups')
+    await asyncio.gather(*(group.stop() for group in groups))
+    for task in runners + [reporter]:
+        task.cancel()
+    await asyncio.gather(*runners, reporter, return_exceptions=True)
+    print('👋 Supervisor stopped')
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,108 @@
+import json
+import os
+import random
+import re
+import time
+from rapidfuzz import fuzz, process
+
+_NON_ALNUM = re.compile(r'[^0-9a-z]+')
+
+def normalize(text):
+    """Lowercase and collapse everything but letters/digits to single spaces"""
+    return _NON_ALNUM.sub(' ', text.lower()).strip()
+
+class CharacterIndex:
+    """
+    Precomputed index over data/data.json for mguess: a names list for O(1)
+    random choice, normalized alias sets and rapidfuzz typo matching.
+    Reloads itself when the JSON files change on disk.
+    Optional data/aliases.json maps a character name to extra aliases.
+    """
+    def __init__(self, path='data/data.json', aliases_path='data/aliases.json', fuzzy_threshold=85, check_interval=5):
+        self.path = path
+        self.aliases_path = aliases_path
+        self.fuzzy_threshold = fuzzy_threshold
+        self.check_interval = check_interval
+        self.names = []
+        self.urls = {}
+        self.name_aliases = {}  # name -> set of normalized aliases
+        self.mtimes = None
+        self.last_check = 0
+        self.refresh(force=True)
+
+    def _stat(self):
+        mtimes = []
+        for path in (self.path, self.aliases_path):
+            try:
+                mtimes.append(os.stat(path).st_mtime_ns)
+            except OSError:
+                mtimes.append(None)
+        return tuple(mtimes)
+
+    def refresh(self, force=False):
+        """Reload if the data files changed (checked at most every check_interval seconds)"""
+        now = time.monotonic()
+        if not force and now - self.last_check < self.check_interval:
+            return
+        self.last_check = now
+        mtimes = self._stat()
+        if mtimes != self.mtimes:
+            self.mtimes = mtimes
+            self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'r') as f:
+                urls = json.load(f)
+        except:
+            urls = {}
+        try:
+            with open(self.aliases_path, 'r') as f:
+                extra = json.load(f)
+        except:
+            extra = {}
+
+        name_aliases = {}
+        token_owners = {}
+        for name in urls:
+            full = normalize(name)
+            name_aliases[name] = {full, full.replace(' ', '')} | {normalize(a) for a in extra.get(name, [])}
+            for token in full.split():
+                if len(token) >= 4:
+                    token_owners.setdefault(token, set()).add(name)
+        # Single-word aliases ("ayaka", "raiden") only when no other character shares them
+        for token, owners in token_owners.items():
+            if len(owners) == 1:
+                name_aliases[next(iter(owners))].add(token)
+
+        self.urls = urls
+        self.names = list(urls)
+        self.name_aliases = {name: {a for a in aliases if a} for name, aliases in name_aliases.items()}
+        alias_count = sum(len(aliases) for aliases in self.name_aliases.values())
+        print(f'📚 Character index loaded ({len(self.names)} characters, {alias_count} aliases)')
+
+    def __len__(self):
+        self.refresh()
+        return len(self.names)
+
+    def random_name(self):
+        self.refresh()
+        return random.choice(self.names)
+
+    def url(self, name):
+        return self.urls[name]
+
+    def matches(self, name, text):
+        """True if a chat message names the character (alias or close fuzzy match)"""
+        guess = normalize(text)
+        if not guess:
+            return False
+        aliases = self.name_aliases.get(name) or {normalize(name)}
+        padded = f' {guess} '
+        for alias in aliases:
+            if f' {alias} ' in padded:
+                return True
+        # Typos: compare whole short messages against each alias
+        if len(guess) <= 40:
+            return process.extractOne(guess, aliases, scorer=fuzz.ratio, score_cutoff=self.fuzzy_threshold) is not None
+        return False
@@ -0,0 +1,29 @@
+from fuzzywuzzy import fuzz
+
+def normalize(text):
+    """Lowercase once per string instead of once per pair"""
+    return str(text or '').lower()
+
+def score_matrix(queries, choices, normalized=False):
+    """
+    fuzzywuzzy partial_ratio (int 0-100) of every query against every choice.
+    Returns a list of rows, one per query. The scorer is kept on fuzzywuzzy on
+    purpose: rapidfuzz's partial_ratio aligns differently and scores higher on
+    many OCR reads, which would loosen the > 70 verification threshold.
+    """
+    if not normalized:
+        queries = [normalize(query) for query in queries]
+        choices = [normalize(choice) for choice in choices]
+    return [[fuzz.partial_ratio(query, choice) for choice in choices] for query in queries]
+
+def best_match(queries, choices, threshold=0, normalized=False):
+    """
+    Highest scoring (query index, choice index, score) with score > threshold,
+    or None. Ties go to the earlier query, then the earlier choice.
+    """
+    best = None
+    for i, row in enumerate(score_matrix(queries, choices, normalized)):
+        for j, score in enumerate(row):
+            if score > threshold and (best is None or score > best[2]):
+                best = (i, j, score)
+    return best
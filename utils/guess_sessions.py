@@ -0,0 +1,68 @@
+import asyncio
+
+class GuessSession:
+    """One running guess game in a channel"""
+    def __init__(self, channel_id):
+        self.channel_id = channel_id
+        self.answer = None
+        self.normalized_answer = None
+        self.check = None
+        self.future = asyncio.get_running_loop().create_future()
+        self.timer = None
+
+    async def wait(self):
+        """Winning message, or None when the game timed out"""
+        return await self.future
+
+class GuessSessionManager:
+    """
+    Keeps at most one game per channel and routes guesses to it from a
+    single on_message listener with one dict lookup per message.
+    """
+    def __init__(self):
+        self.sessions = {}  # channel_id -> GuessSession
+
+    def open(self, channel_id):
+        """Reserve the channel for a new game, or None if one is already running"""
+        if channel_id in self.sessions:
+            return None
+        session = GuessSession(channel_id)
+        self.sessions[channel_id] = session
+        return session
+
+    def arm(self, session, answer, timeout, check=None):
+        """
+        Start accepting guesses for answer and schedule the timeout.
+        check(content) decides if a message is correct, defaults to a substring test.
+        """
+        session.answer = answer
+        session.normalized_answer = answer.lower()
+        session.check = check
+        session.timer = asyncio.get_running_loop().call_later(timeout, self.finish, session, None)
+
+    def finish(self, session, winner):
+        """End a game with the winning message (None on timeout)"""
+        if self.sessions.get(session.channel_id) is session:
+            del self.sessions[session.channel_id]
+        if session.timer:
+            session.timer.cancel()
+        if not session.future.done():
+            session.future.set_result(winner)
+
+    def handle_message(self, message):
+        """Check a message against its channel's game, returns True if it won"""
+        session = self.sessions.get(message.channel.id)
+        if session is None or session.normalized_answer is None or message.author.bot:
+            return False
+        if session.check:
+            correct = session.check(message.content)
+        else:
+            correct = session.normalized_answer in message.content.lower()
+        if correct:
+            self.finish(session, message)
+            return True
+        return False
+
+    def close_all(self):
+        for session in list(self.sessions.values()):
+            self.finish(session, None)
@@ -0,0 +1,95 @@
+import asyncio
+import os
+import random
+import aiohttp
+from utils.lifecycle import lifecycle
+from utils.metrics import metrics, BYTES_BUCKETS
+
+DOWNLOAD_SECONDS = metrics.histogram('bot_image_download_seconds', 'Image download latency including retries')
+DOWNLOAD_BYTES = metrics.histogram('bot_image_download_bytes', 'Downloaded image size', buckets=BYTES_BUCKETS)
+DOWNLOAD_ERRORS = metrics.counter('bot_image_download_errors_total', 'Failed image downloads')
+
+class DownloadTooLarge(Exception):
+    """Raised when a response body exceeds the allowed size"""
+
+class HTTPClient:
+    """Bot-wide pooled aiohttp session for image downloads"""
+    def __init__(self):
+        self.session = None
+        self.max_bytes = int(os.getenv('HTTP_MAX_BYTES', 8 * 1024 * 1024))
+        self.retries = int(os.getenv('HTTP_RETRIES', 3))
+        self.chunk_size = 64 * 1024
+        self.headers = {'User-Agent': 'Mozilla/5.0'}
+
+    def get_session(self):
+        """Create the shared session on first use (needs a running event loop)"""
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=int(os.getenv('HTTP_POOL_SIZE', 50)),
+                limit_per_host=int(os.getenv('HTTP_POOL_PER_HOST', 10)),
+                ttl_dns_cache=300,
+                keepalive_timeout=60
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=30, connect=5, sock_read=10),
+                headers=self.headers
+            )
+            lifecycle.register('http', self.close)
+        return self.session
+
+    async def _read_capped(self, response, max_bytes):
+        if response.content_length and response.content_length > max_bytes:
+            raise DownloadTooLarge(f'{response.url} is {response.content_length} bytes (max {max_bytes})')
+        body = bytearray()
+        async for chunk in response.content.iter_chunked(self.chunk_size):
+            body.extend(chunk)
+            if len(body) > max_bytes:
+                raise DownloadTooLarge(f'{response.url} exceeded {max_bytes} bytes')
+        return bytes(body)
+
+    async def fetch_bytes(self, url, max_bytes=None, headers=None):
+        """
+        Download url in chunks, stopping at max_bytes.
+        Retries connection errors, timeouts, 429 and 5xx with exponential backoff.
+        """
+        try:
+            with DOWNLOAD_SECONDS.time():
+                body = await self._fetch(url, max_bytes, headers)
+        except Exception:
+            DOWNLOAD_ERRORS.inc()
+            raise
+        DOWNLOAD_BYTES.observe(len(body))
+        return body
+
+    async def _fetch(self, url, max_bytes, headers):
+        max_bytes = max_bytes or self.max_bytes
+        session = self.get_session()
+        for attempt in range(self.retries + 1):
+            try:
+                async with session.get(url, headers=headers) as response:
+                    if response.status == 429 or response.status >= 500:
+                        if attempt < self.retries:
+                            raise aiohttp.ClientResponseError(
+                                response.request_info, response.history,
+                                status=response.status, message=response.reason
+                            )
+                    response.raise_for_status()
+                    return await self._read_capped(response, max_bytes)
+            except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError,
+                    aiohttp.ClientResponseError, asyncio.TimeoutError) as e:
+                retryable = not isinstance(e, aiohttp.ClientResponseError) or e.status == 429 or e.status >= 500
+                if not retryable or attempt >= self.retries:
+                    raise
+                delay = 0.5 * (2 ** attempt) + random.uniform(0, 0.25)
+                print(f'🔁 Download retry {attempt + 1}/{self.retries} for {url}: {e}')
+                await asyncio.sleep(delay)
+
+    async def close(self):
+        """Close the shared session"""
+        if self.session and not self.session.closed:
+            await self.session.close()
+            print("🔌 HTTP session closed")
+
+# Global HTTP client instance
+http_client = HTTPClient()
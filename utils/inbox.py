@@ -0,0 +1,71 @@
+from collections import OrderedDict
+from utils.metrics import metrics
+
+FIRESTORE_SECONDS = metrics.histogram('bot_firestore_query_seconds', 'Firestore query latency', labels=('operation',))
+
+class InboxRepository:
+    """
+    Contact inbox on the async Firestore client, newest first.
+    Pages are fetched lazily with limit + start_after cursors and kept in a
+    small LRU so paging back and forth only reads what is shown.
+    format_row turns each fetched document dict into the row the UI shows.
+    """
+    def __init__(self, db, collection='contact', per_page=5, max_cached_pages=20, format_row=None):
+        self.db = db
+        self.format_row = format_row
+        self.collection = collection
+        self.per_page = per_page
+        self.max_cached_pages = max_cached_pages
+        self.pages = OrderedDict()  # page -> (messages, last snapshot, has_next)
+        self.total = None
+
+    def query(self):
+        return self.db.collection(self.collection).order_by('timestamp', direction='DESCENDING')
+
+    async def count(self):
+        """Total number of messages (aggregation query), None if unsupported"""
+        if self.total is None:
+            try:
+                with FIRESTORE_SECONDS.time('contact.count'):
+                    result = await self.query().count().get()
+                self.total = int(result[0][0].value)
+            except Exception as e:
+                print(f'Inbox count unavailable: {e}')
+        return self.total
+
+    def cached_page(self, page):
+        """(messages, has_next) if the page is already fetched, else None"""
+        cached = self.pages.get(page)
+        if cached:
+            self.pages.move_to_end(page)
+            return cached[0], cached[2]
+        return None
+
+    async def get_page(self, page):
+        """Returns (messages, has_next) for a page"""
+        cached = self.cached_page(page)
+        if cached:
+            return cached
+
+        query = self.query().limit(self.per_page + 1)
+        previous = self.pages.get(page - 1)
+        if page > 0 and previous:
+            query = query.start_after(previous[1])
+        elif page > 0:
+            query = query.offset(page * self.per_page)
+
+        with FIRESTORE_SECONDS.time('contact.page'):
+            snapshots = [doc async for doc in query.stream()]
+        has_next = len(snapshots) > self.per_page
+        snapshots = snapshots[:self.per_page]
+        messages = [doc.to_dict() for doc in snapshots]
+        if self.format_row:
+            messages = [self.format_row(data) for data in messages]
+        self.pages[page] = (messages, snapshots[-1] if snapshots else None, has_next)
+        while len(self.pages) > self.max_cached_pages:
+            self.pages.popitem(last=False)
+        return messages, has_next
+
+    def invalidate(self):
+        self.pages.clear()
+        self.total = None
@@ -0,0 +1,277 @@
+"""
+Inventory backends for the collection cog (INVENTORY_BACKEND=file|mongo).
+Before switching to mongo, copy the JSON inventories into the collection:
+
+    python -m utils.inventory_store import [inventory_dir] [--user NAME]
+"""
+import argparse
+import asyncio
+import heapq
+import itertools
+import json
+import os
+import re
+from collections import OrderedDict
+from config.database import mongodb
+from utils.lifecycle import lifecycle
+from utils.metrics import metrics
+
+INVENTORY_SECONDS = metrics.histogram('bot_inventory_load_seconds', 'Inventory reads', labels=('backend', 'operation'))
+INVENTORY_CACHE = metrics.counter('bot_inventory_cache_total', 'Inventory file cache lookups', labels=('result',))
+
+SORTS = ('code', '-code')
+IMPORT_BATCH_SIZE = 500
+
+def iter_json_array(path, chunk_size=64 * 1024):
+    """Yield the items of a top-level JSON array without loading the whole file"""
+    decoder = json.JSONDecoder()
+    with open(path, 'r') as f:
+        buf = f.read(chunk_size)
+        pos = 0
+        eof = not buf
+        started = False
+        while True:
+            while pos < len(buf) and buf[pos] in ' \t\r\n,':
+                if buf[pos] == ',' and not started:
+                    raise ValueError('Expected a JSON array')
+                pos += 1
+            if pos >= len(buf):
+                if eof:
+                    return
+                more = f.read(chunk_size)
+                eof = not more
+                buf, pos = buf[pos:] + more, 0
+                continue
+            if not started:
+                if buf[pos] != '[':
+                    raise ValueError('Expected a JSON array')
+                started = True
+                pos += 1
+                continue
+            if buf[pos] == ']':
+                return
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                more = f.read(chunk_size)
+                eof = not more
+                buf, pos = buf[pos:] + more, 0
+                continue
+            yield item
+            pos = end
+
+def select_page(cards, offset, limit, sort=None, prefix=None):
+    """
+    One page of cards from any iterable, keeping at most offset + limit cards
+    in memory. Returns (page, total matching cards).
+    """
+    total = 0
+    def matching():
+        nonlocal total
+        for card in cards:
+            if 'code' in card and (not prefix or card['code'].startswith(prefix)):
+                total += 1
+                yield card
+    if sort == 'code':
+        kept = heapq.nsmallest(offset + limit, matching(), key=lambda c: c['code'])
+    elif sort == '-code':
+        kept = heapq.nlargest(offset + limit, matching(), key=lambda c: c['code'])
+    else:
+        stream = matching()
+        kept = list(itertools.islice(stream, offset + limit))
+        for _ in stream:
+            pass
+    return kept[offset:offset + limit], total
+
+class FileInventoryStore:
+    """
+    Inventories from data/inventory/<username>.json with an in-memory LRU of
+    parsed files and a code -> card index per user. A cached inventory is
+    reused until the file's mtime or size changes on disk.
+    """
+    def __init__(self, inventory_dir='data/inventory', max_users=None, stream_bytes=None):
+        self.inventory_dir = inventory_dir
+        self.max_users = max_users or int(os.getenv('INVENTORY_CACHE_USERS', 256))
+        # Files larger than this are paged by streaming instead of being cached whole
+        self.stream_bytes = stream_bytes or int(os.getenv('INVENTORY_STREAM_BYTES', 1024 * 1024))
+        self.cache = OrderedDict()  # username -> {'stamp', 'cards', 'by_code'}
+        self.stats = {'hits': 0, 'misses': 0}
+        os.makedirs(self.inventory_dir, exist_ok=True)
+
+    def get_inventory_path(self, username):
+        return os.path.join(self.inventory_dir, f"{username}.json")
+
+    def _stamp(self, path):
+        try:
+            st = os.stat(path)
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def _read(self, path):
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except:
+            return []
+
+    async def _entry(self, username):
+        path = self.get_inventory_path(username)
+        stamp = self._stamp(path)
+        entry = self.cache.get(username)
+        if entry and entry['stamp'] == stamp:
+            self.cache.move_to_end(username)
+            self.stats['hits'] += 1
+            INVENTORY_CACHE.inc(1, 'hit')
+            return entry
+        self.stats['misses'] += 1
+        INVENTORY_CACHE.inc(1, 'miss')
+        with INVENTORY_SECONDS.time('file', 'load'):
+            cards = await asyncio.to_thread(self._read, path) if stamp else []
+        entry = {
+            'stamp': stamp,
+            'cards': cards,
+            'by_code': {card['code']: card for card in cards if 'code' in card}
+        }
+        self.cache[username] = entry
+        self.cache.move_to_end(username)
+        while len(self.cache) > self.max_users:
+            self.cache.popitem(last=False)
+        return entry
+
+    async def get_inventory(self, username):
+        """All cards of a user (empty list if none)"""
+        return (await self._entry(username))['cards']
+
+    async def get_card(self, username, code):
+        """A single card by code, or None"""
+        return (await self._entry(username))['by_code'].get(code)
+
+    async def get_page(self, username, offset, limit, sort=None, prefix=None):
+        """One page of a user's cards, returns (cards, total)"""
+        path = self.get_inventory_path(username)
+        stamp = self._stamp(path)
+        if stamp is None:
+            return [], 0
+        entry = self.cache.get(username)
+        if (entry and entry['stamp'] == stamp) or stamp[1] <= self.stream_bytes:
+            cards = (await self._entry(username))['cards']
+            return select_page(cards, offset, limit, sort, prefix)
+
+        def stream():
+            try:
+                return select_page(iter_json_array(path), offset, limit, sort, prefix)
+            except (OSError, ValueError):
+                return [], 0
+        with INVENTORY_SECONDS.time('file', 'stream_page'):
+            return await asyncio.to_thread(stream)
+
+    def invalidate(self, username=None):
+        if username is None:
+            self.cache.clear()
+        else:
+            self.cache.pop(username, None)
+
+class MongoInventoryStore:
+    """Inventories in the Mongo 'inventory' collection, indexed on (user, code)"""
+    def __init__(self, collection_name='inventory'):
+        self.collection_name = collection_name
+        self.indexed = False
+
+    async def get_collection(self):
+        await lifecycle.acquire('mongodb', mongodb.connect, mongodb.close)
+        collection = mongodb.get_collection(self.collection_name)
+        if not self.indexed:
+            await collection.create_index([('user', 1), ('code', 1)], unique=True)
+            self.indexed = True
+        return collection
+
+    async def get_inventory(self, username):
+        collection = await self.get_collection()
+        with INVENTORY_SECONDS.time('mongo', 'load'):
+            return await collection.find({'user': username}, {'_id': 0, 'user': 0}).to_list(length=None)
+
+    async def get_card(self, username, code):
+        collection = await self.get_collection()
+        with INVENTORY_SECONDS.time('mongo', 'card'):
+            return await collection.find_one({'user': username, 'code': code}, {'_id': 0, 'user': 0})
+
+    async def get_page(self, username, offset, limit, sort=None, prefix=None):
+        """One page of a user's cards via an indexed skip/limit cursor, returns (cards, total)"""
+        collection = await self.get_collection()
+        query = {'user': username}
+        if prefix:
+            query['code'] = {'$regex': '^' + re.escape(prefix)}
+        cursor = collection.find(query, {'_id': 0, 'user': 0})
+        if sort in SORTS:
+            cursor = cursor.sort('code', -1 if sort.startswith('-') else 1)
+        with INVENTORY_SECONDS.time('mongo', 'page'):
+            cards = await cursor.skip(offset).limit(limit).to_list(length=limit)
+            total = await collection.count_documents(query)
+        return cards, total
+
+    async def import_inventory(self, username, cards):
+        """Upsert a user's cards, e.g. when migrating a JSON inventory file. Returns the cards written"""
+        from pymongo import UpdateOne
+        requests = [
+            UpdateOne({'user': username, 'code': card['code']}, {'$set': {**card, 'user': username}}, upsert=True)
+            for card in cards if 'code' in card
+        ]
+        if not requests:
+            return 0
+        collection = await self.get_collection()
+        await collection.bulk_write(requests, ordered=False)
+        return len(requests)
+
+    def invalidate(self, username=None):
+        pass
+
+def create_inventory_store():
+    """Inventory backend selected by INVENTORY_BACKEND (file or mongo)"""
+    if os.getenv('INVENTORY_BACKEND', 'file').lower() == 'mongo':
+        return MongoInventoryStore()
+    return FileInventoryStore()
+
+async def import_files(store, inventory_dir='data/inventory', users=None):
+    """
+    Stream every <username>.json in inventory_dir into a MongoInventoryStore,
+    IMPORT_BATCH_SIZE cards per bulk write. Returns (users, cards) imported.
+    """
+    filenames = sorted(name for name in os.listdir(inventory_dir) if name.endswith('.json'))
+    if users:
+        filenames = [name for name in filenames if name[:-5] in users]
+    user_count = card_count = 0
+    for filename in filenames:
+        username = filename[:-5]
+        path = os.path.join(inventory_dir, filename)
+        written = 0
+        try:
+            cards = iter_json_array(path)
+            while batch := list(itertools.islice(cards, IMPORT_BATCH_SIZE)):
+                written += await store.import_inventory(username, batch)
+        except (OSError, ValueError) as e:
+            print(f'❌ Skipped {path} after {written} cards: {e}')
+            continue
+        user_count += 1
+        card_count += written
+        print(f'📥 {username}: {written} cards')
+    return user_count, card_count
+
+async def main():
+    parser = argparse.ArgumentParser(description='Copy JSON inventories into the Mongo inventory collection')
+    parser.add_argument('action', choices=['import'])
+    parser.add_argument('path', nargs='?', default='data/inventory')
+    parser.add_argument('--user', action='append', help='only import this user, repeat for several')
+    args = parser.parse_args()
+
+    store = MongoInventoryStore()
+    try:
+        users, cards = await import_files(store, args.path, args.user)
+        print(f'✅ Imported {cards} cards for {users} users from {os.path.abspath(args.path)}')
+    finally:
+        await lifecycle.shutdown()
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,143 @@
+import asyncio
+import json
+import os
+import time
+import discord
+
+class InviteCache:
+    """
+    Guild invite links for the server list, kept warm by a background task.
+    Existing permanent invites (guild.invites()) are reused before a new one
+    is created, guilds are resolved concurrently under a small semaphore,
+    and entries are refreshed after a TTL. Entries persist to a JSON file so
+    a restart does not have to resolve every guild again.
+    """
+    def __init__(self, bot, path=None, ttl=None, concurrency=None, refresh_interval=None):
+        self.bot = bot
+        self.path = path or os.getenv('INVITE_CACHE_PATH', 'data/invite_cache.json')
+        self.ttl = ttl or int(os.getenv('INVITE_CACHE_TTL', 6 * 3600))
+        self.refresh_interval = refresh_interval or int(os.getenv('INVITE_REFRESH_INTERVAL', 600))
+        self.semaphore = asyncio.Semaphore(concurrency or int(os.getenv('INVITE_CONCURRENCY', 4)))
+        self.entries = {}  # guild_id -> {'url': str|None, 'expires': epoch seconds}
+        self.pending = {}  # guild_id -> task
+        self.task = None
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'r') as f:
+                self.entries = {int(k): v for k, v in json.load(f).items()}
+        except:
+            self.entries = {}
+
+    async def save(self):
+        data = {str(k): v for k, v in self.entries.items()}
+
+        def write():
+            with open(self.path, 'w') as f:
+                json.dump(data, f)
+        await asyncio.to_thread(write)
+
+    def start(self):
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._refresh_loop())
+
+    def get(self, guild_id):
+        """Cached entry for a guild ({'url': ...}) or None if not resolved yet"""
+        return self.entries.get(guild_id)
+
+    def forget(self, guild_id):
+        self.entries.pop(guild_id, None)
+
+    def is_stale(self, guild_id):
+        entry = self.entries.get(guild_id)
+        return entry is None or entry['expires'] < time.time()
+
+    async def _find_invite(self, guild):
+        me = guild.me
+        # Reuse a permanent invite if we can see them
+        if me.guild_permissions.manage_guild:
+            try:
+                for invite in await guild.invites():
+                    if not invite.max_age and not invite.max_uses and not invite.temporary:
+                        return invite.url
+            except discord.Forbidden:
+                pass
+        for channel in guild.text_channels:
+            if channel.permissions_for(me).create_instant_invite:
+                try:
+                    # unique=False lets Discord hand back an existing matching invite
+                    invite = await channel.create_invite(
+                        max_age=0,
+                        max_uses=0,
+                        unique=False,
+                        reason='Auto-generated for bot owner'
+                    )
+                    return invite.url
+                except discord.Forbidden:
+                    continue
+        return None
+
+    async def _resolve(self, guild):
+        async with self.semaphore:
+            for attempt in range(3):
+                try:
+                    url = await self._find_invite(guild)
+                    break
+                except discord.HTTPException as e:
+                    if e.status != 429 or attempt == 2:
+                        print(f'❌ Invite lookup failed for {guild.name}: {e}')
+                        url = None
+                        break
+                    await asyncio.sleep(getattr(e, 'retry_after', None) or 2 ** attempt)
+            self.entries[guild.id] = {'url': url, 'expires': time.time() + self.ttl}
+            return url
+
+    def resolve(self, guild):
+        """Start (or join) the invite lookup for a guild, returns the task"""
+        task = self.pending.get(guild.id)
+        if task is None or task.done():
+            task = asyncio.create_task(self._resolve(guild))
+            self.pending[guild.id] = task
+            task.add_done_callback(lambda t, guild_id=guild.id: self.pending.get(guild_id) is t and self.pending.pop(guild_id))
+        return task
+
+    async def resolve_many(self, guilds, timeout=None):
+        """
+        Resolve stale guilds concurrently. Waits (at most timeout seconds) only
+        for guilds with no entry yet; expired entries refresh in the background.
+        """
+        missing = []
+        for guild in guilds:
+            if self.is_stale(guild.id):
+                task = self.resolve(guild)
+                if guild.id not in self.entries:
+                    missing.append(task)
+        if missing:
+            await asyncio.wait(missing, timeout=timeout)
+
+    async def _refresh_loop(self):
+        await self.bot.wait_until_ready()
+        while True:
+            try:
+                tasks = [self.resolve(guild) for guild in self.bot.guilds if self.is_stale(guild.id)]
+                if tasks:
+                    await asyncio.wait(tasks)
+                known = {guild.id for guild in self.bot.guilds}
+                for guild_id in list(self.entries):
+                    if guild_id not in known:
+                        del self.entries[guild_id]
+                await self.save()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f'❌ Invite refresh failed: {e}')
+            await asyncio.sleep(self.refresh_interval)
+
+    async def close(self):
+        if self.task:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
+        for task in list(self.pending.values()):
+            task.cancel()
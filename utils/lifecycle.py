@@ -0,0 +1,80 @@
+import asyncio
+
+class Lifecycle:
+    """
+    Owns the bot's long-lived resources (Mongo client, HTTP session, OCR
+    workers, ...) and background tasks. Resources start at most once no
+    matter how often a cog is (re)loaded, and shutdown cancels tasks and
+    closes resources in reverse start order.
+    """
+    def __init__(self):
+        self.resources = {}  # name -> (value, close coroutine function), in start order
+        self.starting = {}  # name -> future of an in-progress start
+        self.tasks = set()
+        self.closed = False
+
+    async def acquire(self, name, start, close=None):
+        """
+        Start a resource once and return it. start is a (coroutine) function
+        returning the resource; close is awaited on shutdown.
+        """
+        if name in self.resources:
+            return self.resources[name][0]
+        if name in self.starting:
+            return await asyncio.shield(self.starting[name])
+        future = asyncio.get_running_loop().create_future()
+        self.starting[name] = future
+        try:
+            value = start()
+            if asyncio.iscoroutine(value):
+                value = await value
+            self.resources[name] = (value, close)
+            future.set_result(value)
+            return value
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()
+            raise
+        finally:
+            del self.starting[name]
+
+    def register(self, name, close):
+        """Track an already started resource so it gets closed on shutdown"""
+        if name not in self.resources:
+            self.resources[name] = (None, close)
+
+    async def release(self, name):
+        """Close one resource now (e.g. when its cog is unloaded)"""
+        entry = self.resources.pop(name, None)
+        if entry and entry[1]:
+            await entry[1]()
+
+    def create_task(self, coro, name=None):
+        """asyncio.create_task that keeps a reference and cancels the task on shutdown"""
+        task = asyncio.create_task(coro, name=name)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return task
+
+    async def shutdown(self, timeout=10):
+        """Cancel background tasks, then close resources newest first"""
+        if self.closed:
+            return
+        self.closed = True
+        tasks = list(self.tasks)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.wait(tasks, timeout=timeout)
+        for name in reversed(list(self.resources)):
+            _, close = self.resources.pop(name)
+            if close is None:
+                continue
+            try:
+                await asyncio.wait_for(close(), timeout=timeout)
+            except Exception as e:
+                print(f'❌ Failed to close {name}: {e}')
+        print('👋 Shutdown complete')
+
+# Global lifecycle instance
+lifecycle = Lifecycle()
@@ -0,0 +1,159 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from utils.metrics import metrics, LOOP_LAG
+
+STALLS = metrics.counter('bot_event_loop_stalls_total', 'Event loop stalls longer than LOOP_STALL_THRESHOLD')
+
+class _SlowCallbackHandler(logging.Handler):
+    """Picks up asyncio's 'Executing <handle> took N seconds' debug-mode warnings"""
+    def __init__(self, watchdog):
+        super().__init__(logging.WARNING)
+        self.watchdog = watchdog
+
+    def emit(self, record):
+        if not str(record.msg).startswith('Executing') or len(record.args or ()) != 2:
+            return
+        handle, duration = record.args
+        self.watchdog.record({
+            'kind': 'slow_callback',
+            'at': time.time(),
+            'duration': duration,
+            'task': str(handle),
+            'stack': '',
+        })
+
+class LoopWatchdog:
+    """
+    Event loop lag monitor.
+    - a heartbeat task measures how late the loop wakes up (feeds LOOP_LAG)
+    - a watcher thread notices a stale heartbeat and captures the loop
+      thread's stack plus the running task while the loop is still blocked
+    - with LOOP_DEBUG=1, asyncio debug mode reports slow callbacks too
+    Keeps a ring buffer of recent stalls and a heap of the worst ones.
+    """
+    def __init__(self, interval=None, threshold=None, keep=None):
+        self.interval = interval or float(os.getenv('LOOP_HEARTBEAT', 0.1))
+        self.threshold = threshold or float(os.getenv('LOOP_STALL_THRESHOLD', 0.25))
+        self.keep = keep or int(os.getenv('LOOP_STALL_KEEP', 20))
+        self.debug = os.getenv('LOOP_DEBUG', '0') == '1'
+        self.recent = deque(maxlen=self.keep)
+        self.worst = []  # min-heap of (duration, seq, entry)
+        self.seq = itertools.count()
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.loop = None
+        self.loop_thread_id = None
+        self.last_beat = 0.0
+        self.max_lag = 0.0
+        self.last_lag = 0.0
+        self.task = None
+        self.thread = None
+        self.handler = None
+
+    def start(self):
+        if self.task is not None:
+            return
+        self.loop = asyncio.get_running_loop()
+        self.loop_thread_id = threading.get_ident()
+        self.last_beat = time.monotonic()
+        if self.debug:
+            self.loop.set_debug(True)
+            self.loop.slow_callback_duration = self.threshold
+            self.handler = _SlowCallbackHandler(self)
+            logging.getLogger('asyncio').addHandler(self.handler)
+        self.stop_event.clear()
+        self.task = asyncio.create_task(self._heartbeat())
+        self.thread = threading.Thread(target=self._watch, name='loop-watchdog', daemon=True)
+        self.thread.start()
+        print(f'🐶 Loop watchdog on (stall threshold {self.threshold * 1000:.0f}ms)')
+
+    async def _heartbeat(self):
+        while True:
+            start = self.loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, self.loop.time() - start - self.interval)
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            LOOP_LAG.observe(lag)
+            self.last_beat = time.monotonic()
+
+    def _current_task(self):
+        # Read-only peek at another thread's loop state, good enough for a diagnostic
+        task = asyncio.tasks._current_tasks.get(self.loop)
+        if task is None:
+            return 'callback (no task)'
+        coro = task.get_coro()
+        return f'{task.get_name()} {getattr(coro, "__qualname__", coro)}'
+
+    def _watch(self):
+        stall = None
+        while not self.stop_event.wait(self.interval / 2):
+            beat = self.last_beat
+            stale = time.monotonic() - beat
+            if stall is not None and stall['beat'] != beat:
+                # Loop is running again, the stall is over
+                stall.pop('beat')
+                self.record(stall)
+                STALLS.inc()
+                stall = None
+            if stall is None and stale > self.threshold + self.interval:
+                frame = sys._current_frames().get(self.loop_thread_id)
+                stall = {
+                    'kind': 'stall',
+                    'at': time.time(),
+                    'beat': beat,
+                    'duration': 0.0,
+                    'task': self._current_task(),
+                    'stack': ''.join(traceback.format_stack(frame, limit=25)) if frame else '',
+                }
+            if stall is not None:
+                stall['duration'] = time.monotonic() - beat - self.interval
+
+    def record(self, entry):
+        with self.lock:
+            self.recent.append(entry)
+            item = (entry['duration'], next(self.seq), entry)
+            if len(self.worst) < self.keep:
+                heapq.heappush(self.worst, item)
+            elif item[0] > self.worst[0][0]:
+                heapq.heapreplace(self.worst, item)
+
+    def worst_offenders(self, limit=None):
+        with self.lock:
+            items = sorted(self.worst, reverse=True)
+        return [entry for _, _, entry in items[:limit]]
+
+    def recent_stalls(self, limit=None):
+        with self.lock:
+            items = list(self.recent)[::-1]
+        return items[:limit]
+
+    def reset(self):
+        with self.lock:
+            self.recent.clear()
+            self.worst = []
+        self.max_lag = 0.0
+
+    async def close(self):
+        self.stop_event.set()
+        if self.task:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
+        if self.thread:
+            await asyncio.to_thread(self.thread.join, 1)
+            self.thread = None
+        if self.handler:
+            logging.getLogger('asyncio').removeHandler(self.handler)
+            self.handler = None
+
+# Global watchdog instance
+watchdog = LoopWatchdog()
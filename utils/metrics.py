@@ -0,0 +1,161 @@
+import bisect
+import os
+import time
+from aiohttp import web
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+BYTES_BUCKETS = (1024, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{str(v)}"' for k, v in pairs) + '}'
+
+class _Timer:
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.start
+        self.histogram.observe(self.elapsed, *self.labels)
+
+class Counter:
+    type = 'counter'
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.label_names = labels
+        self.values = {}
+
+    def inc(self, amount=1, *labels):
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def samples(self):
+        for labels, value in self.values.items():
+            yield self.name + _format_labels(self.label_names, labels), value
+
+class Gauge:
+    type = 'gauge'
+
+    def __init__(self, name, help, labels=(), func=None):
+        self.name = name
+        self.help = help
+        self.label_names = labels
+        self.values = {}
+        self.func = func
+
+    def set(self, value, *labels):
+        self.values[labels] = value
+
+    def samples(self):
+        if self.func is not None:
+            try:
+                yield self.name, self.func()
+            except Exception:
+                pass
+        for labels, value in self.values.items():
+            yield self.name + _format_labels(self.label_names, labels), value
+
+class Histogram:
+    type = 'histogram'
+
+    def __init__(self, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.label_names = labels
+        self.buckets = tuple(buckets)
+        self.values = {}  # labels -> [bucket counts..., sum, count]
+
+    def observe(self, value, *labels):
+        series = self.values.get(labels)
+        if series is None:
+            series = self.values[labels] = [0] * (len(self.buckets) + 2)
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            series[index] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def time(self, *labels):
+        """Context manager observing the elapsed seconds of its block"""
+        return _Timer(self, labels)
+
+    def samples(self):
+        for labels, series in self.values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                yield self.name + '_bucket' + _format_labels(self.label_names, labels, [('le', bound)]), cumulative
+            yield self.name + '_bucket' + _format_labels(self.label_names, labels, [('le', '+Inf')]), series[-1]
+            yield self.name + '_sum' + _format_labels(self.label_names, labels), series[-2]
+            yield self.name + '_count' + _format_labels(self.label_names, labels), series[-1]
+
+class Registry:
+    """Process-wide metrics in Prometheus text format"""
+    def __init__(self):
+        self.metrics = {}
+
+    def _get(self, cls, name, help, **kwargs):
+        metric = self.metrics.get(name)
+        if metric is None:
+            metric = self.metrics[name] = cls(name, help, **kwargs)
+        elif 'func' in kwargs:
+            # Re-registered by a reloaded cog: point at the new instance
+            metric.func = kwargs['func']
+        return metric
+
+    def counter(self, name, help, labels=()):
+        return self._get(Counter, name, help, labels=labels)
+
+    def gauge(self, name, help, labels=(), func=None):
+        return self._get(Gauge, name, help, labels=labels, func=func)
+
+    def histogram(self, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        return self._get(Histogram, name, help, labels=labels, buckets=buckets)
+
+    def render(self):
+        lines = []
+        for metric in self.metrics.values():
+            lines.append(f'# HELP {metric.name} {metric.help}')
+            lines.append(f'# TYPE {metric.name} {metric.type}')
+            for sample, value in metric.samples():
+                lines.append(f'{sample} {value}')
+        return '\n'.join(lines) + '\n'
+
+# Global metrics registry
+metrics = Registry()
+
+# Fed by the loop watchdog heartbeat (utils/loop_watchdog.py)
+LOOP_LAG = metrics.histogram('bot_event_loop_lag_seconds', 'Extra delay of a scheduled loop wake-up')
+
+class MetricsServer:
+    """Local HTTP server exposing GET /metrics (METRICS_PORT, 0 disables)"""
+    def __init__(self, host=None, port=None):
+        self.host = host or os.getenv('METRICS_HOST', '127.0.0.1')
+        self.port = int(port if port is not None else os.getenv('METRICS_PORT', 9108))
+        self.runner = None
+
+    async def handle_metrics(self, request):
+        return web.Response(text=metrics.render(), content_type='text/plain', charset='utf-8')
+
+    async def start(self):
+        if self.runner is not None or not self.port:
+            return
+        app = web.Application()
+        app.router.add_get('/metrics', self.handle_metrics)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, self.host, self.port).start()
+        print(f'📈 Metrics on http://{self.host}:{self.port}/metrics')
+
+    async def close(self):
+        if self.runner:
+            await self.runner.cleanup()
+            self.runner = None
@@ -0,0 +1,109 @@
+import cv2
+import numpy as np
+from utils.ocr_pool import worker_reader
+
+FIELDS = ('name', 'series', 'gen')
+
+# nori repo coordinates for Sofi drop (x, y, w, h of name, series, gen for 3 cards)
+CARD_COORDS = [
+    # Card 1
+    (12, 458, 290, 26),    # name
+    (12, 487, 290, 26),    # series
+    (36, 427, 108, 26),    # gen
+    # Card 2
+    (361, 458, 290, 26),   # name
+    (361, 487, 290, 26),   # series
+    (385, 427, 108, 26),   # gen
+    # Card 3
+    (704, 458, 290, 26),   # name
+    (704, 487, 290, 26),   # series
+    (728, 427, 108, 26),   # gen
+]
+
+# Every box sits in this horizontal strip of a 3-card drop at REFERENCE_WIDTH
+REFERENCE_WIDTH = 1008
+BAND_TOP = 427
+BAND_BOTTOM = 513
+
+def roi_box(card, field):
+    """(x, y, w, h) of a field box for card 1-3"""
+    return CARD_COORDS[(card-1)*3 + FIELDS.index(field)]
+
+def all_roi_keys(card_count=3):
+    return [(card, field) for card in range(1, card_count+1) for field in FIELDS]
+
+def decode_text_band(buffer):
+    """
+    Decode a drop image straight to grayscale and keep only the text band
+    (BAND_TOP..BAND_BOTTOM), rescaled to REFERENCE_WIDTH when the image is
+    not at the size CARD_COORDS were measured on. The band is copied out so
+    the full decoded image can be freed right away.
+    buffer: the downloaded bytes (wrapped by np.frombuffer, not copied)
+    Returns a uint8 array of shape (BAND_BOTTOM - BAND_TOP, REFERENCE_WIDTH) or None.
+    """
+    grey = cv2.imdecode(np.frombuffer(buffer, np.uint8), cv2.IMREAD_GRAYSCALE)
+    if grey is None:
+        return None
+    height, width = grey.shape
+    scale = width / REFERENCE_WIDTH
+    if abs(scale - 1) < 0.01:
+        band = grey[BAND_TOP:BAND_BOTTOM, :REFERENCE_WIDTH]
+        if band.shape == (BAND_BOTTOM - BAND_TOP, REFERENCE_WIDTH):
+            return band.copy()
+    top = min(height, int(BAND_TOP * scale))
+    bottom = min(height, max(top + 1, round(BAND_BOTTOM * scale)))
+    if top >= height:
+        return None
+    return cv2.resize(grey[top:bottom], (REFERENCE_WIDTH, BAND_BOTTOM - BAND_TOP), interpolation=cv2.INTER_AREA)
+
+def band_roi(band, card, field):
+    """Zero-copy view of one field box in a text band"""
+    x, y, w, h = roi_box(card, field)
+    return band[y - BAND_TOP:y - BAND_TOP + h, x:x + w]
+
+def read_rois_batch(items):
+    """
+    Reads known ROIs from one or more text bands.
+    Runs inside an OCR worker process. Text detection is skipped since the
+    boxes are fixed: the crops are cut straight from the bands and go to
+    easyocr's get_text grouped by padded width (name/series vs gen). On GPU
+    each group is one recognizer batch. On CPU the crops run one at a time,
+    as Reader.recognize does there, since padded batches measured slower.
+    items: list of (band from decode_text_band, [(card, field), ...])
+    Returns: one {(card, field): text} dict per item
+    """
+    from easyocr.easyocr import imgH
+    from easyocr.recognition import get_text
+    from easyocr.utils import get_image_list
+    reader = worker_reader()
+    groups = {}  # padded width -> [((item, key), crop), ...]
+    for i, (band, keys) in enumerate(items):
+        for key in keys:
+            x, y, w, h = roi_box(*key)
+            crops, width = get_image_list([[x, x + w, y - BAND_TOP, y - BAND_TOP + h]], [], band, model_height=imgH)
+            # get_text hands the coordinates back untouched, so they carry (item, key)
+            groups.setdefault(width, []).extend(((i, key), crop) for _, crop in crops)
+
+    results = [{key: '' for key in keys} for _, keys in items]
+    ignore_char = ''.join(set(reader.character) - set(reader.lang_char))
+    for width, image_list in groups.items():
+        batch_size = 1 if reader.device == 'cpu' else len(image_list)
+        predictions = get_text(reader.character, imgH, int(width), reader.recognizer, reader.converter,
+                               image_list, ignore_char=ignore_char, batch_size=batch_size,
+                               workers=0, device=reader.device)
+        for (i, key), text, _ in predictions:
+            results[i][key] = text.strip()
+    return results
+
+def extract_card_fields(items):
+    """
+    Extracts name, series, and gen for up to 3 cards using nori repo's coordinates.
+    Batch function for OCRPool.run_batched, items are (text band, card_count).
+    Returns: per item a list of dicts: {'card': idx, 'name': str, 'series': str, 'gen': str}
+    """
+    texts = read_rois_batch([(band, all_roi_keys(card_count)) for band, card_count in items])
+    return [
+        [{'card': card, **{field: text[(card, field)] for field in FIELDS}}
+         for card in range(1, card_count+1)]
+        for (_, card_count), text in zip(items, texts)
+    ]
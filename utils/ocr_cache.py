@@ -0,0 +1,91 @@
+import hashlib
+import os
+import sys
+import time
+from collections import OrderedDict
+
+def content_digest(data):
+    """128-bit digest of the downloaded image bytes"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+class OCRCache:
+    """
+    Bounded LRU of OCR'd drop texts, keyed by a content digest of the image
+    bytes with a URL alias. Entries hold {(card, field): text} and expire
+    after a TTL; the oldest entries are evicted once the entry count or
+    memory cap is exceeded. Only byte-identical images share an entry:
+    different drops share most of their layout, so any nearest-match lookup
+    would hand one drop another drop's text.
+    """
+    def __init__(self, max_entries=None, ttl=None, max_bytes=None):
+        self.max_entries = max_entries or int(os.getenv('OCR_CACHE_SIZE', 512))
+        self.ttl = ttl or int(os.getenv('OCR_CACHE_TTL', 3600))
+        self.max_bytes = max_bytes or int(os.getenv('OCR_CACHE_MAX_BYTES', 1024 * 1024))
+        self.entries = OrderedDict()  # digest -> {'texts', 'urls', 'expires', 'size'}
+        self.urls = {}  # url -> digest
+        self.size = 0
+        self.stats = {'url_hits': 0, 'hash_hits': 0, 'misses': 0, 'evictions': 0}
+
+    def _entry(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry['expires'] < time.monotonic():
+            self._remove(key)
+            return None
+        self.entries.move_to_end(key)
+        return entry
+
+    def _remove(self, key):
+        entry = self.entries.pop(key)
+        self.size -= entry['size']
+        for url in entry['urls']:
+            if self.urls.get(url) == key:
+                del self.urls[url]
+
+    def get_by_url(self, url):
+        """Cached texts for a URL, or None (counts as a miss only via get_by_hash)"""
+        key = self.urls.get(url)
+        entry = self._entry(key) if key is not None else None
+        if entry is None:
+            return None
+        self.stats['url_hits'] += 1
+        return dict(entry['texts'])
+
+    def get_by_hash(self, digest, url=None):
+        """Cached texts for an image with exactly these bytes, or None"""
+        entry = self._entry(digest)
+        if entry is None:
+            self.stats['misses'] += 1
+            return None
+        self.stats['hash_hits'] += 1
+        if url:
+            entry['urls'].add(url)
+            self.urls[url] = digest
+        return dict(entry['texts'])
+
+    def put(self, url, digest, texts):
+        """Merge freshly OCR'd texts into the entry for this image"""
+        entry = self._entry(digest)
+        if entry is None:
+            entry = {'texts': {}, 'urls': set(), 'size': sys.getsizeof(digest) + 256}
+            self.entries[digest] = entry
+            self.size += entry['size']
+        for field_key, text in texts.items():
+            if field_key not in entry['texts']:
+                added = sys.getsizeof(text) + 64
+                entry['size'] += added
+                self.size += added
+            entry['texts'][field_key] = text
+        if url:
+            entry['urls'].add(url)
+            self.urls[url] = digest
+        entry['expires'] = time.monotonic() + self.ttl
+        while self.entries and (len(self.entries) > self.max_entries or self.size > self.max_bytes):
+            self._remove(next(iter(self.entries)))
+            self.stats['evictions'] += 1
+
+    def hit_rate(self):
+        hits = self.stats['url_hits'] + self.stats['hash_hits']
+        total = hits + self.stats['misses']
+        return hits / total if total else 0.0
@@ -0,0 +1,200 @@
+import asyncio
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Reader owned by the current worker process (set by _init_worker)
+_reader = None
+
+def _init_worker():
+    """Preload one easyocr reader per worker process"""
+    global _reader
+    import easyocr
+    use_gpu = False
+    try:
+        import torch
+        use_gpu = torch.cuda.is_available()
+    except:
+        pass
+    _reader = easyocr.Reader(['en'], gpu=use_gpu)
+    print(f'🚀 OCR worker {os.getpid()} ready (GPU={use_gpu})')
+
+def worker_reader():
+    """Get the reader of the current worker process"""
+    if _reader is None:
+        raise Exception("OCR reader not initialized in this process")
+    return _reader
+
+def _ping():
+    return os.getpid()
+
+class OCRJobDropped(Exception):
+    """Raised for a queued job that was evicted to make room for a newer one"""
+
+class _Job:
+    __slots__ = ('func', 'args', 'future', 'batched', 'enqueued_at')
+
+    def __init__(self, func, args, future, batched=False):
+        self.func = func
+        self.args = args
+        self.future = future
+        self.batched = batched
+        self.enqueued_at = time.monotonic()
+
+class OCRPool:
+    """
+    Process pool where each worker holds its own preloaded easyocr reader.
+    Jobs wait in a bounded queue; when it is full the oldest pending job is
+    dropped so fresh drops are always served first.
+    """
+    def __init__(self, workers=None, max_queue=None, max_batch=None):
+        self.workers = workers or int(os.getenv('OCR_WORKERS', min(2, os.cpu_count() or 1)))
+        self.max_queue = max_queue or int(os.getenv('OCR_QUEUE_SIZE', 16))
+        self.max_batch = max_batch or int(os.getenv('OCR_MAX_BATCH', 4))
+        self.executor = None
+        self.queue = deque()
+        self.queue_event = None
+        self.dispatchers = []
+        self.restart_lock = None
+        self.restart_delay = 1.0
+        self.stats = {'submitted': 0, 'completed': 0, 'dropped': 0, 'failed': 0, 'restarts': 0}
+
+    def start(self):
+        """Start the worker processes and dispatchers (idempotent)"""
+        if self.executor is not None:
+            return
+        self.executor = self._new_executor()
+        self.restart_lock = asyncio.Lock()
+        self.queue_event = asyncio.Event()
+        self.dispatchers = [asyncio.create_task(self._dispatch()) for _ in range(self.workers)]
+        print(f'🧵 OCR pool started ({self.workers} workers, queue={self.max_queue})')
+
+    def _new_executor(self):
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker
+        )
+
+    async def _restart(self, broken):
+        """
+        Replace a broken executor (a worker died: OOM, crash in the reader)
+        with a fresh one. Dispatchers that hit the same broken executor only
+        rebuild it once; repeated failures back off up to a minute.
+        """
+        async with self.restart_lock:
+            if self.executor is not broken:
+                return
+            print(f'💥 OCR worker died, restarting the pool in {self.restart_delay:.0f}s')
+            await asyncio.sleep(self.restart_delay)
+            self.restart_delay = min(self.restart_delay * 2, 60.0)
+            broken.shutdown(wait=False, cancel_futures=True)
+            self.executor = self._new_executor()
+            self.stats['restarts'] += 1
+
+    async def warm_up(self):
+        """Force every worker to load its reader now instead of on the first drop"""
+        self.start()
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*[loop.run_in_executor(self.executor, _ping) for _ in range(self.workers)])
+
+    async def run(self, func, *args):
+        """Queue func(*args) for a worker process and await its result"""
+        return await self._submit(_Job(func, args, None))
+
+    async def run_batched(self, func, item):
+        """
+        Queue one item for a batch function. Items queued back to back for the
+        same func are handed to a single func([item, ...]) call, which must
+        return one result per item.
+        """
+        return await self._submit(_Job(func, item, None, batched=True))
+
+    async def _submit(self, job):
+        self.start()
+        job.future = asyncio.get_running_loop().create_future()
+        if len(self.queue) >= self.max_queue:
+            oldest = self.queue.popleft()
+            self.stats['dropped'] += 1
+            if not oldest.future.done():
+                oldest.future.set_exception(OCRJobDropped('OCR queue full, job dropped'))
+        self.queue.append(job)
+        self.stats['submitted'] += 1
+        self.queue_event.set()
+        return await job.future
+
+    def _take_batch(self, first):
+        """Pull further queued items for the same batch function"""
+        jobs = [first]
+        while (self.queue and len(jobs) < self.max_batch and
+               self.queue[0].batched and self.queue[0].func is first.func):
+            job = self.queue.popleft()
+            if not job.future.done():
+                jobs.append(job)
+        return jobs
+
+    async def _dispatch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            while not self.queue:
+                self.queue_event.clear()
+                await self.queue_event.wait()
+            if self.restart_lock.locked():
+                # Hold queued jobs back until the replacement pool is up
+                async with self.restart_lock:
+                    pass
+                continue
+            job = self.queue.popleft()
+            if job.future.done():
+                continue
+            jobs = self._take_batch(job) if job.batched else [job]
+            executor = self.executor
+            try:
+                if job.batched:
+                    results = await loop.run_in_executor(executor, job.func, [j.args for j in jobs])
+                else:
+                    results = [await loop.run_in_executor(executor, job.func, *job.args)]
+                for j, result in zip(jobs, results):
+                    if not j.future.done():
+                        j.future.set_result(result)
+                self.stats['completed'] += len(jobs)
+                self.restart_delay = 1.0
+            except BrokenProcessPool as e:
+                # Only the jobs that were running on the dead pool fail, queued ones wait for the new one
+                self.stats['failed'] += len(jobs)
+                for j in jobs:
+                    if not j.future.done():
+                        j.future.set_exception(e)
+                await self._restart(executor)
+            except asyncio.CancelledError:
+                for j in jobs:
+                    if not j.future.done():
+                        j.future.cancel()
+                raise
+            except Exception as e:
+                self.stats['failed'] += len(jobs)
+                for j in jobs:
+                    if not j.future.done():
+                        j.future.set_exception(e)
+
+    def queue_depth(self):
+        return len(self.queue)
+
+    async def close(self):
+        """Stop dispatchers, fail pending jobs and shut the worker processes down"""
+        for task in self.dispatchers:
+            task.cancel()
+        await asyncio.gather(*self.dispatchers, return_exceptions=True)
+        self.dispatchers = []
+        while self.queue:
+            job = self.queue.popleft()
+            if not job.future.done():
+                job.future.cancel()
+        if self.executor is not None:
+            executor = self.executor
+            self.executor = None
+            await asyncio.to_thread(executor.shutdown, True, cancel_futures=True)
+            print('🔌 OCR pool stopped')
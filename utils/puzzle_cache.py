@@ -0,0 +1,161 @@
+import asyncio
+import os
+import random
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from PIL import Image, ImageFilter
+from utils.http_client import http_client
+
+def decode_image(img_data):
+    """Decode character image bytes into a loaded PIL image"""
+    image = Image.open(BytesIO(img_data))
+    image.load()
+    return image
+
+def render_puzzle(image):
+    """
+    Random crop of a character image, blurred half of the time.
+    Returns (png_bytes, blurred)
+    """
+    width, height = image.size
+
+    # Create crop dimensions
+    crop_width = min(200, int(width * 0.3))
+    crop_height = min(200, int(height * 0.3))
+
+    if crop_width <= 0 or crop_height <= 0:
+        raise Exception('Image too small to crop')
+
+    # Random crop position
+    left = random.randint(0, width - crop_width)
+    top = random.randint(0, height - crop_height)
+
+    cropped = image.crop((left, top, left + crop_width, top + crop_height))
+
+    # Maybe blur
+    should_blur = random.choice([True, False])
+    if should_blur:
+        cropped = cropped.filter(ImageFilter.GaussianBlur(radius=8))
+
+    buffer = BytesIO()
+    cropped.save(buffer, format='PNG')
+    return buffer.getvalue(), should_blur
+
+def image_size(image):
+    return image.width * image.height * len(image.getbands())
+
+class PuzzlePrefetcher:
+    """
+    Keeps a warm, memory-bounded pool of decoded character images and a queue
+    of pre-rendered puzzles so starting a game needs no network or rendering.
+    """
+    def __init__(self, index, ready_target=None, puzzles_per_character=None, max_bytes=None):
+        self.index = index
+        self.ready_target = ready_target or int(os.getenv('PUZZLE_READY', 8))
+        self.puzzles_per_character = puzzles_per_character or int(os.getenv('PUZZLE_PER_CHARACTER', 3))
+        self.max_bytes = max_bytes or int(os.getenv('PUZZLE_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+        self.images = OrderedDict()  # name -> (image, img_data, size)
+        self.images_bytes = 0
+        self.pending = {}  # name -> in-flight download future
+        self.ready = deque()  # (name, img_data, puzzle_png, blurred)
+        self.executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='puzzle')
+        self.wakeup = asyncio.Event()
+        self.task = None
+        self.stats = {'prefetched': 0, 'served': 0, 'fallbacks': 0, 'errors': 0}
+
+    def start(self):
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._fill())
+
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    async def load_character(self, name):
+        """Decoded image and raw bytes for a character, downloading on a cache miss"""
+        cached = self.images.get(name)
+        if cached:
+            self.images.move_to_end(name)
+            return cached[0], cached[1]
+        # The prefetch loop and an on-demand render can miss on the same name, download it once
+        if name in self.pending:
+            return await asyncio.shield(self.pending[name])
+        future = asyncio.get_running_loop().create_future()
+        self.pending[name] = future
+        try:
+            img_data = await http_client.fetch_bytes(self.index.url(name))
+            image = await self._run(decode_image, img_data)
+            self._store(name, image, img_data)
+            future.set_result((image, img_data))
+            return image, img_data
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()
+            raise
+        finally:
+            del self.pending[name]
+
+    def _store(self, name, image, img_data):
+        previous = self.images.pop(name, None)
+        if previous:
+            self.images_bytes -= previous[2]
+        size = image_size(image) + len(img_data)
+        self.images[name] = (image, img_data, size)
+        self.images_bytes += size
+        while len(self.images) > 1 and self.images_bytes > self.max_bytes:
+            _, (_, _, evicted) = self.images.popitem(last=False)
+            self.images_bytes -= evicted
+
+    async def render(self, name):
+        """Render one puzzle for a character off the event loop"""
+        image, img_data = await self.load_character(name)
+        puzzle_png, blurred = await self._run(render_puzzle, image)
+        return name, img_data, puzzle_png, blurred
+
+    async def _fill(self):
+        while True:
+            if not len(self.index) or len(self.ready) >= self.ready_target:
+                self.wakeup.clear()
+                await self.wakeup.wait()
+                continue
+            name = self.index.random_name()
+            try:
+                image, img_data = await self.load_character(name)
+                for _ in range(self.puzzles_per_character):
+                    puzzle_png, blurred = await self._run(render_puzzle, image)
+                    self.ready.append((name, img_data, puzzle_png, blurred))
+                self.stats['prefetched'] += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats['errors'] += 1
+                print(f'❌ Puzzle prefetch failed for {name}: {e}')
+                await asyncio.sleep(5)
+
+    async def take(self):
+        """
+        A random ready puzzle: (name, img_data, puzzle_png, blurred).
+        Renders one on demand if the pool is empty.
+        """
+        self.wakeup.set()
+        if self.ready:
+            # Puzzles are queued per character, so pick a random one to avoid repeats
+            position = random.randrange(len(self.ready))
+            self.ready.rotate(-position)
+            item = self.ready.popleft()
+            self.ready.rotate(position)
+            if item[0] in self.index.urls:
+                self.stats['served'] += 1
+                return item
+        self.stats['fallbacks'] += 1
+        return await self.render(self.index.random_name())
+
+    async def close(self):
+        if self.task:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,112 @@
+import asyncio
+import json
+import os
+import time
+
+def parse_shard_ids(value):
+    """'0-3,6' -> [0, 1, 2, 3, 6], empty -> None"""
+    if not value:
+        return None
+    shard_ids = []
+    for part in value.split(','):
+        part = part.strip()
+        if '-' in part:
+            start, end = part.split('-', 1)
+            shard_ids.extend(range(int(start), int(end) + 1))
+        elif part:
+            shard_ids.append(int(part))
+    return sorted(set(shard_ids))
+
+def split_shards(shard_count, groups):
+    """Split shard ids 0..shard_count-1 into contiguous ranges, one per process"""
+    groups = max(1, min(groups, shard_count))
+    size, extra = divmod(shard_count, groups)
+    ranges = []
+    start = 0
+    for group in range(groups):
+        end = start + size + (1 if group < extra else 0)
+        ranges.append(list(range(start, end)))
+        start = end
+    return ranges
+
+def format_shard_ids(shard_ids):
+    """[0, 1, 2, 5] -> '0-2,5'"""
+    parts = []
+    for shard_id in shard_ids:
+        if parts and parts[-1][1] == shard_id - 1:
+            parts[-1][1] = shard_id
+        else:
+            parts.append([shard_id, shard_id])
+    return ','.join(str(a) if a == b else f'{a}-{b}' for a, b in parts)
+
+def shard_settings():
+    """(shard_count, shard_ids) from SHARD_COUNT / SHARD_IDS, or None when not sharded"""
+    count = os.getenv('SHARD_COUNT')
+    if not count:
+        return None
+    # 'auto' lets Discord pick the shard count
+    shard_count = None if count == 'auto' else int(count)
+    return shard_count, parse_shard_ids(os.getenv('SHARD_IDS'))
+
+class ShardStatus:
+    """
+    Writes this process' per-shard latency and guild counts to
+    <SHARD_STATUS_DIR>/<SHARD_GROUP>.json for the supervisor to report.
+    """
+    def __init__(self, bot, directory=None, group=None, interval=15):
+        self.bot = bot
+        self.directory = directory or os.getenv('SHARD_STATUS_DIR', 'data/shards')
+        self.group = group if group is not None else os.getenv('SHARD_GROUP', '0')
+        self.interval = interval
+        self.task = None
+
+    @property
+    def path(self):
+        return os.path.join(self.directory, f'{self.group}.json')
+
+    def snapshot(self):
+        latencies = getattr(self.bot, 'latencies', None) or [(self.bot.shard_id or 0, self.bot.latency)]
+        # latency is NaN until the shard has heartbeated once
+        shards = {shard_id: {'latency': latency if latency == latency else None, 'guilds': 0}
+                  for shard_id, latency in latencies}
+        for guild in self.bot.guilds:
+            shard = shards.setdefault(guild.shard_id, {'latency': None, 'guilds': 0})
+            shard['guilds'] += 1
+        return {
+            'group': self.group,
+            'pid': os.getpid(),
+            'updated': time.time(),
+            'ready': self.bot.is_ready(),
+            'shards': {str(shard_id): shard for shard_id, shard in sorted(shards.items())},
+        }
+
+    async def write(self):
+        data = self.snapshot()
+
+        def write():
+            os.makedirs(self.directory, exist_ok=True)
+            tmp = self.path + '.tmp'
+            with open(tmp, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp, self.path)
+        await asyncio.to_thread(write)
+
+    def start(self):
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._loop())
+
+    async def _loop(self):
+        while True:
+            try:
+                await self.write()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f'❌ Failed to write shard status: {e}')
+            await asyncio.sleep(self.interval)
+
+    async def close(self):
+        if self.task:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
@@ -0,0 +1,46 @@
+import re
+
+# Card lines start with `1], `2] or `3] (backtick optional)
+_CARD_LINE = re.compile(r'`?([123])\]')
+# Hearts and gen id in one scan: group 1 = hearts, group 2 = gid
+_HEARTS_GID = re.compile(r':heart:\s+`(\d+)|`ɢ\s*(\d+)')
+_NAME = re.compile(r'`[0-9]+\]\s+.+?•\s+\*\*(.+?)\*\*')
+
+def parse_drop(content):
+    """
+    Parses a Sofi drop message in one pass per line.
+    Returns: List of dicts: {'card': 1-3, 'name': str|None, 'gid': int|None, 'hearts': int}
+    or None when the message is not a drop.
+    """
+    if '0]' in content or ']' not in content:
+        return None
+    cards = []
+    for line in content.split('\n'):
+        position = _CARD_LINE.match(line.strip())
+        if not position:
+            continue
+        hearts = None
+        gid = None
+        for match in _HEARTS_GID.finditer(line):
+            if match.lastindex == 1:
+                if hearts is None:
+                    hearts = int(match.group(1))
+            elif gid is None:
+                gid = int(match.group(2))
+            if hearts is not None and gid is not None:
+                break
+        name_match = _NAME.search(line)
+        cards.append({
+            'card': int(position.group(1)),
+            'name': name_match.group(1).strip() if name_match else None,
+            'gid': gid,
+            'hearts': hearts or 0
+        })
+    return cards or None
+
+def find_pog_cards(content):
+    """Cards of a drop worth alerting on: more than 99 hearts or a gen id under 100"""
+    cards = parse_drop(content)
+    if not cards:
+        return []
+    return [card for card in cards if card['hearts'] > 99 or (card['gid'] and card['gid'] < 100)]
@@ -0,0 +1,19 @@
+import time
+
+async def load_cogs(bot, cogs):
+    """
+    Load extensions once, reporting how long each one took.
+    Returns {cog: seconds} for the cogs that loaded.
+    """
+    timings = {}
+    started = time.perf_counter()
+    for cog in cogs:
+        start = time.perf_counter()
+        try:
+            await bot.load_extension(cog)
+            timings[cog] = time.perf_counter() - start
+            print(f'✅ Loaded {cog} ({timings[cog] * 1000:.0f} ms)')
+        except Exception as e:
+            print(f'❌ Failed to load {cog}: {e}')
+    print(f'🚀 Loaded {len(timings)}/{len(cogs)} cogs in {(time.perf_counter() - started) * 1000:.0f} ms')
+    return timings